@@ -1,16 +1,17 @@
 import threading
+import queue
 import time
 import random
+import math
 import os
-import subprocess
+import glob
 import re
+from functools import partial
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Optional
 
 import numpy as np
 import sounddevice as sd
-import torch
-
-from silero_vad import load_silero_vad, get_speech_timestamps
 
 from util.logger import info, warning, error
 from hw.hw_state import HWState
@@ -23,23 +24,113 @@ from hw.leaving_sequence import LeavingSequence
 from hw.speaker import Speaker
 from util.env_utils import load_personality
 from util.whisper import transcribe
-from util.ollama import query_ollama
+from util.ollama import query_ollama_stream
+from util.audio_utils import rms as audio_rms
 from util.audio_constants import SAMPLE_RATE, RMS_GATE, BUFFER_SIZE, VAD_MIN_SPEECH_MS, VAD_THRESHOLD, VAD_MIN_SILENCE_MS, SPEECH_PADDING_MS
 #
 # Adaptive RMS gate config and state (idea from original VAD-based version)
 ADAPTIVE_RMS_ALPHA = 0.05        # EMA smoothing factor for baseline
 ADAPTIVE_GATE_MULTIPLIER = 3.0   # dynamic gate = baseline * multiplier
 ADAPTIVE_MIN_GATE = 0.001        # absolute floor on gate
+_STATIC_GATE_FLOOR = max(ADAPTIVE_MIN_GATE, RMS_GATE)
+
+# Energy/zero-crossing pre-filter before Silero, applied only while not in speech:
+# chunks barely above the gate must also cross zero often enough to look like
+# speech rather than hum or rumble
+PREFILTER_STRONG_GATE_MULT = 1.5
+PREFILTER_ZCR_MIN = 0.02  # zero crossings per sample
+
+# Log how often the RMS pre-filter spares us a Silero call, every N chunks
+VAD_STATS_LOG_EVERY = 60
+
+# Fixed Silero get_speech_timestamps arguments, built once
+_VAD_KWARGS = dict(
+    sampling_rate=SAMPLE_RATE,
+    return_seconds=True,
+    threshold=VAD_THRESHOLD,
+    min_speech_duration_ms=VAD_MIN_SPEECH_MS,
+    min_silence_duration_ms=VAD_MIN_SILENCE_MS,
+    speech_pad_ms=SPEECH_PADDING_MS,
+)
+
+# Sentence boundary used to hand streamed LLM output to TTS one sentence at a time
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+")
+
+# Special tokens some models leak into replies, e.g. </start_of_turn> or <|endoftext|>
+_TAG_RE = re.compile(r"</?start_of_turn>|</?end_of_turn>|<\|[^>]*\|>")
 
 # Debounced end-of-speech parameters
 END_SILENCE_CONFIRM_SEC = 1.0
 
+# Quiet window after our own speech ends, used to recalibrate the RMS baseline
+POST_TTS_QUIET_SEC = 0.2
+
 # How long we bias toward assuming a visitor is still present
 # after the last good distance reading (in seconds).
 EXIT_GRACE_SEC = 2.0
 
 # Ignore very short utterances (do not transcribe or play music)
 MIN_UTTERANCE_SEC = 0.60  # 600 ms (keeps sub-0.6s clips away from Whisper's short-utterance guard)
+
+# Longest utterance kept for transcription; audio past this is dropped
+MAX_UTTERANCE_SEC = 30.0
+
+# Mic chunks that may wait for the conversation thread (~30 s at 0.5 s chunks)
+AUDIO_QUEUE_MAX_CHUNKS = 60
+
+# User/assistant messages kept in the LLM history (the system prompt is
+# always kept), so long conversations do not grow every prompt without bound
+MAX_CHAT_HISTORY_MESSAGES = 40
+
+# (previous_state, distance band) -> next state, see _determine_state.
+# Bands: near (d <= engaged), mid (engaged < d <= idle), far_grace (d > idle
+# but presence seen within EXIT_GRACE_SEC), far (d > idle, grace expired).
+STATE_TRANSITIONS = {
+    (HWState.IDLE, "near"): HWState.ENGAGED,
+    (HWState.IDLE, "mid"): HWState.APPROACHING,
+    (HWState.IDLE, "far_grace"): HWState.IDLE,
+    (HWState.IDLE, "far"): HWState.IDLE,
+    (HWState.APPROACHING, "near"): HWState.ENGAGED,
+    (HWState.APPROACHING, "mid"): HWState.APPROACHING,
+    (HWState.APPROACHING, "far_grace"): HWState.APPROACHING,
+    (HWState.APPROACHING, "far"): HWState.IDLE,
+    (HWState.ENGAGED, "near"): HWState.ENGAGED,
+    (HWState.ENGAGED, "mid"): HWState.LEAVING,
+    (HWState.ENGAGED, "far_grace"): HWState.LEAVING,
+    (HWState.ENGAGED, "far"): HWState.IDLE,
+    (HWState.LEAVING, "near"): HWState.ENGAGED,
+    (HWState.LEAVING, "mid"): HWState.LEAVING,
+    (HWState.LEAVING, "far_grace"): HWState.LEAVING,
+    (HWState.LEAVING, "far"): HWState.IDLE,
+}
+
+# Spoken when a visitor leaves (ENGAGED/LEAVING -> IDLE)
+FAREWELLS = (
+    "Goodbye. Come back soon.",
+    "Thanks for visiting. Travel safely.",
+    "It was good to see you. Don't be a stranger.",
+    "I will be here when you return.",
+    "Thanks for sharing this moment with me. Goodbye.",
+    "Farewell until our paths cross again.",
+    "May your path stay bright.",
+    "I hope to see you again soon.",
+    "Goodbye for now.",
+)
+
+# Spoken when a visitor becomes ENGAGED
+ENGAGED_LINES = (
+    "Hello there, it is good to see you.",
+    "Welcome. I am glad you are here.",
+    "Hi there! Thank you for coming.",
+    "Hello. It is nice to share this moment with you.",
+    "Hi. Your presence brightens me.",
+    "Good to see you. Stay as long as you like.",
+    "Hello, I am so glad you are here.",
+    "Hi! is good to see you.",
+    "Hello my friend. I can sense your presence.",
+    "Hello. I am glad you came by.",
+)
+
 class EngagementController:
     """High level controller that drives HWState based on radar distance.
     """
@@ -60,6 +151,11 @@ class EngagementController:
         self.idle_threshold_mm = idle_threshold_mm
         self.engaged_threshold_mm = engaged_threshold_mm
 
+        # Snapshot of LED / motor addresses for the shutdown and fallback paths
+        self._led_addrs: tuple = ()
+        self._motor_addrs: tuple = ()
+        self.refresh_hw_addresses()
+
         # Timestamp of the last confirmed presence reading (in seconds since epoch)
         self._last_presence_ts: float = 0.0
 
@@ -83,19 +179,57 @@ class EngagementController:
             motor_controller=self.motor_controller,
         )
 
+        # State -> (name, sequence) that should run in it
+        self._seq_map = {
+            HWState.IDLE: ("idle", self.idle_sequence),
+            HWState.APPROACHING: ("approaching", self.approaching_sequence),
+            HWState.ENGAGED: ("engaged", self.engaged_sequence),
+            HWState.LEAVING: ("leaving", self.leaving_sequence),
+        }
+
+        # (name, sequence) pairs used when every sequence must be stopped
+        self._all_sequences = tuple(self._seq_map.values())
+
         self.speaker = Speaker()
         self._is_speaking = False
         self._last_assistant_reply: Optional[str] = None
         self._last_spoke_at: float | None = None
         self._speaking_until: float | None = None
 
-        # Silero VAD model and streaming state
-        self._vad_model = load_silero_vad()
+        # Sentences of a streamed LLM reply waiting to be spoken, in order, as
+        # (text, rate, estimated duration) so dropped ones can be un-counted
+        self._tts_queue: "queue.Queue[Optional[tuple[str, int, float]]]" = queue.Queue()
+        self._tts_thread: Optional[threading.Thread] = None
+
+        # Silero VAD model and streaming state. The model (and torch, which
+        # silero-vad pulls in) is loaded on first use or by start().
+        self._vad_model = None
+        self._vad_lock = threading.Lock()
+        # Silero's wrapper keeps per-stream state that get_speech_timestamps
+        # resets and updates, so only one thread may run it at a time
+        self._vad_infer_lock = threading.Lock()
+        self._torch = None
+        self._get_speech_timestamps = None
         self._in_speech: bool = False
-        self._current_utt: np.ndarray = np.array([], dtype=np.float32)
+        # Preallocated utterance buffer; only the first _utt_len samples are valid
+        self._utt_buf: np.ndarray = np.empty(int(SAMPLE_RATE * MAX_UTTERANCE_SEC), dtype=np.float32)
+        self._utt_len: int = 0
+        self._min_utt_samples: int = int(MIN_UTTERANCE_SEC * SAMPLE_RATE)
+
+        # Speculative transcription: started on the first silent chunk after
+        # speech and used if the end of speech is confirmed without new audio.
+        # A single worker also keeps whisper-cli runs from overlapping.
+        self._stt_executor = ThreadPoolExecutor(max_workers=1)
+        self._spec_future: Optional[Future] = None
+        self._spec_len: int = 0
+
+        # Counters for the two-stage (RMS pre-filter -> Silero) VAD
+        self._vad_chunks_seen: int = 0
+        self._vad_chunks_skipped: int = 0
 
         # Adaptive RMS baseline and quiet window after TTS
         self._rms_baseline: Optional[float] = None
+        self._rms_gate: float = _STATIC_GATE_FLOOR
         self._quiet_until_ts: float = 0.0
         self._pending_end_ts: Optional[float] = None
 
@@ -106,9 +240,14 @@ class EngagementController:
         self._stop_event = threading.Event()
         self._thread: Optional[threading.Thread] = None
 
-        # Conversation-loop events / threads
+        # Conversation-loop events / threads. Each conversation gets its own
+        # stop event and mic queue (see _start_conversation), so a thread that
+        # is still finishing a reply can never read a newer conversation's audio.
         self._conversation_stop_event = threading.Event()
         self._conversation_thread: Optional[threading.Thread] = None
+        # Mic chunks (audio, capture time) handed from the PortAudio callback
+        # to the conversation thread; a None item wakes it up to exit
+        self._audio_q: "queue.Queue[Optional[tuple[np.ndarray, float]]]" = queue.Queue(maxsize=AUDIO_QUEUE_MAX_CHUNKS)
 
         # Load environment and personality config for the conversational brain
         personality_name = os.getenv("LIGHTWALL_PERSONALITY", "lightwall")
@@ -116,19 +255,106 @@ class EngagementController:
             self._personality_cfg = load_personality(personality_name)
             system_prompt = self._personality_cfg.get("systemPrompt", "")
             info(f"Loaded personality '{personality_name}' for engagement controller.")
-        except Exception as e:
+        except (OSError, KeyError, ValueError) as e:
             warning(f"Failed to load personality '{personality_name}': {e}")
             self._personality_cfg = {}
             system_prompt = ""
         self._system_prompt = system_prompt
 
+        # Verbose LLM logging (chat tail and reply snippets), off by default
+        self._debug_llm = os.getenv("LIGHTWALL_DEBUG_LLM") == "1"
+
         # Audio directory for thinking audio tracks
         self._audio_directory = os.getenv("AUDIO_DIRECTORY", "")
 
-        # Chat history shared with the LLM
+        # Thinking tracks that actually exist, scanned once: wonder/wonder-###-stereo.wav
+        self._wonder_tracks: tuple[str, ...] = ()
+        if self._audio_directory:
+            self._wonder_tracks = tuple(sorted(glob.glob(
+                os.path.join(self._audio_directory, "wonder", "wonder-*-stereo.wav")
+            )))
+            info(f"Found {len(self._wonder_tracks)} thinking audio tracks.")
+
+        # Chat history shared with the LLM. _initial_chat is the history each
+        # visitor starts from; _chat_lock guards swaps and appends.
+        self._initial_chat: tuple[dict, ...] = (
+            ({"role": "system", "content": system_prompt},) if system_prompt else ()
+        )
+        self._chat_lock = threading.Lock()
         self._chat_messages: list[dict] = []
         self._reset_chat_history()
 
+    def refresh_hw_addresses(self) -> None:
+        """Re-read LED and motor addresses from the controllers.
+
+        Call this if LEDs or motors are added after the controller is built.
+        """
+        self._led_addrs = tuple(self.led_controller.leds.keys())
+        self._motor_addrs = tuple(self.motor_controller.motors.keys())
+
+    def _load_vad_model(self):
+        """Load Silero VAD, preferring the ONNX Runtime build.
+
+        ONNX Runtime avoids the TorchScript interpreter overhead on every
+        chunk, and silero-vad already pins its session to a single intra/inter
+        op thread. Fall back to the TorchScript model if onnxruntime is not
+        installed or the session cannot be created.
+
+        silero-vad and torch are imported here rather than at module load so
+        that constructing the controller stays cheap.
+        """
+        with self._vad_lock:
+            if self._vad_model is not None:
+                return self._vad_model
+
+            import torch
+            from silero_vad import load_silero_vad, get_speech_timestamps
+
+            try:
+                model = load_silero_vad(onnx=True)
+                info("Loaded Silero VAD (ONNX Runtime).")
+            except Exception as e:
+                warning(f"Failed to load ONNX Silero VAD, falling back to TorchScript: {e}")
+                # Silero recommends a single thread for one stream; this also keeps
+                # OpenMP from competing with the audio and control threads
+                torch.set_num_threads(1)
+                try:
+                    torch.set_num_interop_threads(1)
+                except RuntimeError as e:
+                    # Only allowed before any inter-op work has started
+                    warning(f"Could not pin torch inter-op threads: {e}")
+                model = load_silero_vad()
+
+            self._torch = torch
+            self._get_speech_timestamps = get_speech_timestamps
+            self._vad_model = model
+            return model
+
+    def _warmup(self) -> None:
+        """Load Silero VAD and run one pass of VAD and Whisper on silence.
+
+        whisper-cli is a fresh process per utterance, so the useful part of
+        its warmup is pulling the model file into the OS page cache.
+        """
+        dummy = np.zeros(SAMPLE_RATE, dtype=np.float32)
+        try:
+            vad_model = self._load_vad_model()
+            with self._vad_infer_lock:
+                self._get_speech_timestamps(
+                    self._torch.from_numpy(dummy), vad_model, sampling_rate=SAMPLE_RATE
+                )
+        except Exception as e:
+            warning(f"VAD warmup failed: {e}")
+
+        try:
+            started = time.time()
+            # Through the STT worker so it never overlaps a real transcription
+            # sharing the scratch WAV
+            self._stt_executor.submit(transcribe, dummy).result()
+            info(f"Whisper warmup finished in {time.time() - started:.2f}s")
+        except Exception as e:
+            warning(f"Whisper warmup failed: {e}")
+
     def _estimate_speech_duration(self, text: str, rate: int) -> float:
         """Estimate how long text-to-speech will take, in seconds.
 
@@ -151,47 +377,93 @@ class EngagementController:
         while the robot is talking, which helps prevent feedback loops.
         """
         self._is_speaking = True
-        self._last_spoke_at = time.time()
+        now = time.time()
+        self._last_spoke_at = now
+        # Speaker.say returns immediately and queues behind any utterance
+        # already playing, so extend the estimated end of speech from
+        # whichever is later: now or the end of the current utterance.
+        start_at = max(now, self._speaking_until or 0.0)
+        self._speaking_until = start_at + self._estimate_speech_duration(text, rate)
         try:
             self.speaker.say(text=text, rate=rate)
         except Exception as e:
             error(f"Error while speaking: {e}")
+            self._speaking_until = None
         finally:
             self._is_speaking = False
 
+    def _queue_speech(self, text: str, rate: int) -> None:
+        """Queue text for the TTS worker and extend the estimated end of speech."""
+        now = time.time()
+        duration = self._estimate_speech_duration(text, rate)
+        start_at = max(now, self._speaking_until or 0.0)
+        self._speaking_until = start_at + duration
+        self._tts_queue.put((text, rate, duration))
+
+    def _drop_queued_speech(self) -> None:
+        """Discard unspoken sentences and pull the estimated end of speech back.
+
+        Without this the mic would stay gated (and later speech would be
+        scheduled) behind sentences that are never going to play.
+        """
+        dropped = 0.0
+        try:
+            while True:
+                item = self._tts_queue.get_nowait()
+                if item is None:
+                    # Shutdown sentinel; leave it for the worker
+                    self._tts_queue.put(None)
+                    break
+                dropped += item[2]
+        except queue.Empty:
+            pass
+        if not dropped or self._speaking_until is None:
+            return
+        now = time.time()
+        speaking_until = self._speaking_until - dropped
+        self._speaking_until = speaking_until if speaking_until > now else None
+        # The quiet window was anchored to the old end of speech
+        self._quiet_until_ts = min(self._quiet_until_ts, max(now, speaking_until) + POST_TTS_QUIET_SEC)
+
+    def _tts_loop(self) -> None:
+        """Speak queued sentences one after another until a None sentinel arrives."""
+        while True:
+            item = self._tts_queue.get()
+            if item is None:
+                return
+            text, rate, _ = item
+            try:
+                self.speaker.say(text=text, rate=rate, wait=True)
+            except Exception as e:
+                error(f"Error while speaking queued sentence: {e}")
+
     def _update_rms_baseline(self, rms: float) -> None:
         """Update EMA baseline with the current RMS value."""
-        if not np.isfinite(rms):
+        if not math.isfinite(rms):
             return
         if self._rms_baseline is None:
-            self._rms_baseline = rms
+            baseline = rms
         else:
-            self._rms_baseline = (1.0 - ADAPTIVE_RMS_ALPHA) * self._rms_baseline + ADAPTIVE_RMS_ALPHA * rms
+            baseline = (1.0 - ADAPTIVE_RMS_ALPHA) * self._rms_baseline + ADAPTIVE_RMS_ALPHA * rms
+        self._rms_baseline = baseline
+        # The gate only moves with the baseline, so recompute it here
+        dynamic = baseline * ADAPTIVE_GATE_MULTIPLIER
+        self._rms_gate = dynamic if dynamic > _STATIC_GATE_FLOOR else _STATIC_GATE_FLOOR
 
     def _current_rms_gate(self) -> float:
         """Return the effective RMS gate combining static and adaptive thresholds."""
-        base_gate = RMS_GATE if RMS_GATE > 0.0 else 0.0
-        dynamic = (self._rms_baseline or 0.0) * ADAPTIVE_GATE_MULTIPLIER
-        return max(ADAPTIVE_MIN_GATE, base_gate, dynamic)
+        return self._rms_gate
 
     def _tts_is_active(self) -> bool:
-        """Return True if a macOS 'say' process appears to be running.
+        """Return True while our own TTS output is expected to be playing.
 
         This is used to gate VAD so that Lightwall does not listen to its
-        own TTS output. If the check fails, we fall back to assuming TTS
-        is not active.
+        own TTS output. It relies on the estimated end time recorded by
+        _speak rather than scanning the process table on every chunk.
         """
-        try:
-            # pgrep -x 'say' returns 0 if any exact 'say' process exists.
-            result = subprocess.run(
-                ["pgrep", "-x", "say"],
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-            )
-            return result.returncode == 0
-        except Exception as e:
-            warning(f"Conversation: failed to check TTS activity: {e}")
-            return False
+        if self._is_speaking:
+            return True
+        return self._speaking_until is not None and time.time() < self._speaking_until
 
     def _reset_chat_history(self) -> None:
         """Reset chat history so new visitors do not inherit prior conversations.
@@ -200,13 +472,20 @@ class EngagementController:
         messages. This should be called whenever a visitor fully leaves and the
         system returns to an idle state.
         """
-        self._chat_messages = []
-        # Prefer the stored system prompt if available. Fall back to personality cfg.
-        system_prompt = getattr(self, "_system_prompt", None)
-        if not system_prompt and hasattr(self, "_personality_cfg"):
-            system_prompt = self._personality_cfg.get("systemPrompt", "")
-        if system_prompt:
-            self._chat_messages.append({"role": "system", "content": system_prompt})
+        with self._chat_lock:
+            self._chat_messages = list(self._initial_chat)
+
+    def _trim_chat_history(self) -> None:
+        """Drop the oldest turns past MAX_CHAT_HISTORY_MESSAGES. Caller holds _chat_lock."""
+        msgs = self._chat_messages
+        pinned = 1 if msgs and msgs[0].get("role") == "system" else 0
+        excess = len(msgs) - pinned - MAX_CHAT_HISTORY_MESSAGES
+        if excess <= 0:
+            return
+        # Start the kept history on a user turn
+        if msgs[pinned + excess].get("role") == "assistant":
+            excess += 1
+        del msgs[pinned:pinned + excess]
 
     # --------------------------
     # Public lifecycle
@@ -227,6 +506,13 @@ class EngagementController:
         self._thread = threading.Thread(target=self._loop, daemon=True)
         self._thread.start()
 
+        if self._tts_thread is None or not self._tts_thread.is_alive():
+            self._tts_thread = threading.Thread(target=self._tts_loop, daemon=True)
+            self._tts_thread.start()
+
+        # Warm VAD and Whisper off the control thread so the first utterance does not pay for it
+        threading.Thread(target=self._warmup, daemon=True).start()
+
         self.speaker.say("I'm ready to go now")
 
         info("EngagementController started")
@@ -241,13 +527,10 @@ class EngagementController:
         # Stop any active conversation loop
         self._stop_conversation()
 
-        # Turn off all LEDs
+        # Turn off all LEDs (queued on the per-board writers; flushed below)
         try:
-            for addr in self.led_controller.leds.keys():
-                try:
-                    self.led_controller.set_brightness(addr, 0, 1000)
-                except KeyError:
-                    continue
+            for addr in self._led_addrs:
+                self._safe_led_off(addr)
         except Exception as e:
             error(f"Failed to turn off LEDs on stop: {e}")
 
@@ -263,20 +546,42 @@ class EngagementController:
         except Exception as e:
             error(f"Failed to stop sequences on stop: {e}")
 
+        # Make sure the off commands reach the boards before the ports close
+        self.led_controller.flush()
+
         # Return all motors to home position on exit
         try:
-            for addr in self.motor_controller.motors.keys():
-                try:
-                    self.motor_controller.move_to(addr, "CW", 0, 1000)
-                except Exception as e:
-                    error(f"Failed to return motor {addr} to position 0: {e}")
+            self._run_parallel(self._safe_move_home, self._motor_addrs)
         except Exception as e:
             error(f"Motor reset loop failed: {e}")
 
+        # Let the TTS worker exit once it reaches the sentinel
+        self._tts_queue.put(None)
+
         self._thread.join(timeout=1.0)
         self._thread = None
         info("EngagementController stopped and LEDs turned off")
 
+    @staticmethod
+    def _run_parallel(fn, addrs: tuple) -> None:
+        """Call fn(addr) for every address concurrently and wait for all of them."""
+        if not addrs:
+            return
+        with ThreadPoolExecutor(max_workers=min(len(addrs), 8)) as ex:
+            list(ex.map(fn, addrs))
+
+    def _safe_led_off(self, addr) -> None:
+        try:
+            self.led_controller.set_brightness(addr, 0, 1000)
+        except KeyError:
+            pass
+
+    def _safe_move_home(self, addr) -> None:
+        try:
+            self.motor_controller.move_to(addr, "CW", 0, 1000)
+        except Exception as e:
+            error(f"Failed to return motor {addr} to position 0: {e}")
+
     # --------------------------
     # Core loop
     # --------------------------
@@ -304,7 +609,9 @@ class EngagementController:
                     self.hw_state.set_state(new_state)
                     self._apply_led_behavior_for(new_state, prev_state)
 
-                time.sleep(self.poll_interval)
+                # Wake on the next radar sample; the timeout still re-evaluates
+                # stale readings so the exit grace window can expire
+                radar.wait_for_reading(timeout=self.poll_interval)
 
         except Exception as e:
             error(f"EngagementController loop crashed: {e}")
@@ -359,47 +666,18 @@ class EngagementController:
         if self._last_presence_ts > 0.0:
             time_since_presence = now_ts - self._last_presence_ts
 
-        # IDLE
-        if previous_state == HWState.IDLE:
-            if d > idle_thresh:
-                return HWState.IDLE
-            if d > engaged_thresh:
-                return HWState.APPROACHING
-            return HWState.ENGAGED
-
-        # APPROACHING
-        if previous_state == HWState.APPROACHING:
-            if d > idle_thresh:
-                # If we recently saw someone, stay in APPROACHING for a while
-                if time_since_presence is not None and time_since_presence < EXIT_GRACE_SEC:
-                    return HWState.APPROACHING
-                return HWState.IDLE
-            if d <= engaged_thresh:
-                return HWState.ENGAGED
-            return HWState.APPROACHING
-
-        # ENGAGED
-        if previous_state == HWState.ENGAGED:
-            if d > idle_thresh:
-                # If we recently saw someone, assume they are just stepping back.
-                # Move to LEAVING instead of immediately going IDLE.
-                if time_since_presence is not None and time_since_presence < EXIT_GRACE_SEC:
-                    return HWState.LEAVING
-                return HWState.IDLE
-            if d > engaged_thresh:
-                return HWState.LEAVING
-            return HWState.ENGAGED
-
-        # LEAVING
-        if previous_state == HWState.LEAVING:
-            if d > idle_thresh:
-                # Bias toward assuming the visitor is still nearby for a short time.
-                if time_since_presence is not None and time_since_presence < EXIT_GRACE_SEC:
-                    return HWState.LEAVING
-                return HWState.IDLE
-            if d <= engaged_thresh:
-                return HWState.ENGAGED
-            return HWState.LEAVING
+        if d <= engaged_thresh:
+            band = "near"
+        elif d <= idle_thresh:
+            band = "mid"
+        elif time_since_presence is not None and time_since_presence < EXIT_GRACE_SEC:
+            band = "far_grace"
+        else:
+            band = "far"
+
+        next_state = STATE_TRANSITIONS.get((previous_state, band))
+        if next_state is not None:
+            return next_state
 
         # Fallback for unexpected previous_state values
         warning(f"Unknown previous_state '{previous_state}', defaulting to IDLE")
@@ -418,138 +696,31 @@ class EngagementController:
         - In LEAVING, run the leaving LED sequence.
         - In any other state, stop all sequences and turn off LEDs.
         """
-        # IDLE: idle on, others off
-        if state == HWState.IDLE:
-            # If we are returning to idle from ENGAGED or LEAVING, generate a farewell
-            if previous_state in (HWState.ENGAGED, HWState.LEAVING):
-                farewells = [
-                    "Goodbye. Come back soon.",
-                    "Thanks for visiting. Travel safely.",
-                    "It was good to see you. Don't be a stranger.",
-                    "I will be here when you return.",
-                    "Thanks for sharing this moment with me. Goodbye.",
-                    "Farewell until our paths cross again.",
-                    "May your path stay bright.",
-                    "I hope to see you again soon.",
-                    "Goodbye for now."
-                ]
-                text = random.choice(farewells)
+        if state in self._seq_map:
+            if state == HWState.IDLE:
+                # If we are returning to idle from ENGAGED or LEAVING, generate a farewell
+                if previous_state in (HWState.ENGAGED, HWState.LEAVING):
+                    text = random.choice(FAREWELLS)
+                    self._speak(text=text, rate=80)
+
+                # Reset chat so the next visitor starts fresh
+                self._reset_chat_history()
+
+            if state == HWState.ENGAGED:
+                # Speak greeting on transition and start listening
+                text = random.choice(ENGAGED_LINES)
                 self._speak(text=text, rate=80)
+                self._start_conversation()
+            else:
+                # Conversation is only active in ENGAGED
+                self._stop_conversation()
 
-            # Reset chat so the next visitor starts fresh
-            self._reset_chat_history()
-
-            # Stop non idle sequences if running
-            if self.approaching_sequence.is_running():
-                info("Entering IDLE. Stopping approaching sequence.")
-                self.approaching_sequence.stop()
-            if self.engaged_sequence.is_running():
-                info("Entering IDLE. Stopping engaged sequence.")
-                self.engaged_sequence.stop()
-            if self.leaving_sequence.is_running():
-                info("Entering IDLE. Stopping leaving sequence.")
-                self.leaving_sequence.stop()
-
-            # Stop conversation when returning to IDLE
-            self._stop_conversation()
-
-            # Start combined idle sequence when in IDLE
-            if not self.idle_sequence.is_running():
-                info("Entering IDLE. Starting combined idle sequence.")
-                self.idle_sequence.start()
-            return
-
-        # APPROACHING: approaching on, others off
-        if state == HWState.APPROACHING:
-            # Stop idle sequence when leaving IDLE-like behavior
-            if self.idle_sequence.is_running():
-                info("Entering APPROACHING. Stopping combined idle sequence.")
-                self.idle_sequence.stop()
-
-            # Stop other sequences
-            if self.engaged_sequence.is_running():
-                info("Entering APPROACHING. Stopping engaged sequence.")
-                self.engaged_sequence.stop()
-            if self.leaving_sequence.is_running():
-                info("Entering APPROACHING. Stopping leaving sequence.")
-                self.leaving_sequence.stop()
-
-            # Conversation is only active in ENGAGED, ensure it is stopped here
-            self._stop_conversation()
-
-            # Start combined approaching sequence when in APPROACHING
-            if not self.approaching_sequence.is_running():
-                info("Entering APPROACHING. Starting approaching sequence.")
-                self.approaching_sequence.start()
-            return
-
-        # ENGAGED: run engaged sequence and speak greeting on transition
-        if state == HWState.ENGAGED:
-            engaged_lines = [
-                "Hello there, it is good to see you.",
-                "Welcome. I am glad you are here.",
-                "Hi there! Thank you for coming.",
-                "Hello. It is nice to share this moment with you.",
-                "Hi. Your presence brightens me.",
-                "Good to see you. Stay as long as you like.",
-                "Hello, I am so glad you are here.",
-                "Hi! is good to see you.",
-                "Hello my friend. I can sense your presence.",
-                "Hello. I am glad you came by."
-            ]
-            text = random.choice(engaged_lines)
-            self._speak(text=text, rate=80)
-
-            # Stop idle and other sequences
-            if self.idle_sequence.is_running():
-                info("Entering ENGAGED. Stopping combined idle sequence.")
-                self.idle_sequence.stop()
-            if self.approaching_sequence.is_running():
-                info("Entering ENGAGED. Stopping approaching sequence.")
-                self.approaching_sequence.stop()
-            if self.leaving_sequence.is_running():
-                info("Entering ENGAGED. Stopping leaving sequence.")
-                self.leaving_sequence.stop()
-
-            # Start conversation loop while ENGAGED
-            self._start_conversation()
-
-            # Start engaged sequence while ENGAGED
-            if not self.engaged_sequence.is_running():
-                info("Entering ENGAGED. Starting engaged sequence.")
-                self.engaged_sequence.start()
-            return
-
-        # LEAVING: run leaving sequence
-        if state == HWState.LEAVING:
-            # Stop idle and other sequences
-            if self.idle_sequence.is_running():
-                info("Entering LEAVING. Stopping combined idle sequence.")
-                self.idle_sequence.stop()
-            if self.approaching_sequence.is_running():
-                info("Entering LEAVING. Stopping approaching sequence.")
-                self.approaching_sequence.stop()
-            if self.engaged_sequence.is_running():
-                info("Entering LEAVING. Stopping engaged sequence.")
-                self.engaged_sequence.stop()
-
-            # Stop conversation when visitor is leaving
-            self._stop_conversation()
-
-            # Start combined leaving sequence while LEAVING
-            if not self.leaving_sequence.is_running():
-                info("Entering LEAVING. Starting leaving sequence.")
-                self.leaving_sequence.start()
+            self._switch_sequence(state)
             return
 
         # Any other state: stop all sequences and turn off LEDs
         stopped_any = False
-        for name, seq in (
-            ("idle", self.idle_sequence),
-            ("approaching", self.approaching_sequence),
-            ("engaged", self.engaged_sequence),
-            ("leaving", self.leaving_sequence),
-        ):
+        for name, seq in self._all_sequences:
             if seq.is_running():
                 info(f"Stopping {name} sequence due to state={state}.")
                 seq.stop()
@@ -561,7 +732,7 @@ class EngagementController:
             self._stop_conversation()
 
         try:
-            for addr in self.led_controller.leds.keys():
+            for addr in self._led_addrs:
                 try:
                     self.led_controller.set_brightness(addr, 0, 2000)
                 except KeyError:
@@ -569,18 +740,26 @@ class EngagementController:
         except Exception as e:
             error(f"Error while turning off LEDs for state {state}: {e}")
 
+    def _switch_sequence(self, state: str) -> None:
+        """Stop every sequence except the one for state, then start that one."""
+        target_name, target = self._seq_map[state]
+        for name, seq in self._all_sequences:
+            if seq is not target and seq.is_running():
+                info(f"Entering {state}. Stopping {name} sequence.")
+                seq.stop()
+        if not target.is_running():
+            info(f"Entering {state}. Starting {target_name} sequence.")
+            target.start()
+
     def _play_thinking_audio(self) -> bool:
         """Play a random 'wonder' track while the LLM is thinking.
 
         Returns True if playback was successfully started, False otherwise.
         """
-        if not self._audio_directory:
+        if not self._wonder_tracks:
             return False
 
-        # Pick a random track: wonder-###-stereo.wav with ### in [001, 100]
-        idx = random.randint(1, 100)
-        filename = f"wonder-{idx:03d}-stereo.wav"
-        path = os.path.join(self._audio_directory, "wonder", filename)
+        path = random.choice(self._wonder_tracks)
 
         info(f"Starting thinking audio from: {path}")
         try:
@@ -596,12 +775,25 @@ class EngagementController:
     # --------------------------
 
     def _start_conversation(self) -> None:
-        """Start the speech recognition + LLM loop in a background thread."""
-        if self._conversation_thread is not None and self._conversation_thread.is_alive():
-            return
-        self._conversation_stop_event.clear()
+        """Start the speech recognition + LLM loop in a background thread.
+
+        If the previous conversation thread is still winding down (e.g. waiting
+        on Whisper or Ollama), the new thread waits for it to exit before it
+        opens the mic, so two loops never share the utterance state.
+        """
+        previous = self._conversation_thread
+        if previous is not None and previous.is_alive():
+            if not self._conversation_stop_event.is_set():
+                return  # already running
+        else:
+            previous = None
+        stop_event = threading.Event()
+        audio_q: "queue.Queue[Optional[tuple[np.ndarray, float]]]" = queue.Queue(maxsize=AUDIO_QUEUE_MAX_CHUNKS)
+        self._conversation_stop_event = stop_event
+        self._audio_q = audio_q
         self._conversation_thread = threading.Thread(
             target=self._conversation_loop,
+            args=(stop_event, audio_q, previous),
             daemon=True,
         )
         self._conversation_thread.start()
@@ -609,17 +801,30 @@ class EngagementController:
 
     def _stop_conversation(self) -> None:
         """Stop the speech recognition + LLM loop if it is running."""
-        if self._conversation_thread is None:
+        thread = self._conversation_thread
+        if thread is None or self._conversation_stop_event.is_set():
             return
         self._conversation_stop_event.set()
         try:
-            self._conversation_thread.join(timeout=1.0)
+            self._audio_q.put_nowait(None)
+        except queue.Full:
+            pass  # the thread sees the stop event on its next chunk
+        try:
+            thread.join(timeout=1.0)
         except Exception as e:
             warning(f"Error while stopping conversation thread: {e}")
-        self._conversation_thread = None
+        if thread.is_alive():
+            # Still inside Whisper or Ollama; keep the handle so the next
+            # conversation waits for this one to exit
+            warning("Conversation thread still finishing its current turn.")
+        else:
+            self._conversation_thread = None
+
+        # Drop any sentences of a reply that has not been spoken yet
+        self._drop_queued_speech()
         info("EngagementController conversation loop stopped.")
 
-    def _process_transcript(self, text: str) -> None:
+    def _process_transcript(self, text: str, stop_event: threading.Event) -> None:
         """Handle a finalized transcript: update chat, query LLM, and speak the reply."""
         if not text:
             warning("Conversation: empty transcript, ignoring.")
@@ -638,141 +843,215 @@ class EngagementController:
             warning(f'Conversation: ignored placeholder transcript "{marker}"')
             return
 
-        # Append user message
-        self._chat_messages.append({"role": "user", "content": clean_text})
+        # Append user message and take a snapshot to send to the LLM
+        with self._chat_lock:
+            self._chat_messages.append({"role": "user", "content": clean_text})
+            self._trim_chat_history()
+            messages = list(self._chat_messages)
 
         # Query the LLM after speech finishes
-        info(f"Conversation: querying Ollama, chat_messages={len(self._chat_messages)}, last_user_len={len(clean_text)}")
+        info(f"Conversation: querying Ollama, chat_messages={len(messages)}, last_user_len={len(clean_text)}")
         
         # Log the last few messages (role + truncated content) to help debug context issues
-        try:
-            tail = self._chat_messages[-6:]
-            for i, m in enumerate(tail, start=max(0, len(self._chat_messages) - len(tail))):
-                role = m.get("role", "?")
-                content = (m.get("content", "") or "")
-                snippet = content.replace("\n", " ")
-                if len(snippet) > 240:
-                    snippet = snippet[:240] + "…"
-                info(f"Conversation: chat[{i}] role={role} content='{snippet}'")
-        except Exception as e:
-            warning(f"Conversation: failed to log chat tail: {e}")
-
+        if self._debug_llm:
+            try:
+                tail = messages[-6:]
+                for i, m in enumerate(tail, start=max(0, len(messages) - len(tail))):
+                    role = m.get("role", "?")
+                    content = (m.get("content", "") or "")
+                    snippet = content.replace("\n", " ")
+                    if len(snippet) > 240:
+                        snippet = snippet[:240] + "…"
+                    info(f"Conversation: chat[{i}] role={role} content='{snippet}'")
+            except Exception as e:
+                warning(f"Conversation: failed to log chat tail: {e}")
+
+        # Stream the reply and hand each complete sentence to TTS as soon as it
+        # arrives, so speech starts before the whole reply has been generated.
         started = time.time()
+        first_chunk_at: Optional[float] = None
+        reply_parts: list[str] = []
+        pending = ""
+        completed = False
         try:
-            response = query_ollama(self._chat_messages)
+            for delta in query_ollama_stream(messages):
+                if stop_event.is_set():
+                    info("Conversation: stopped while streaming reply, dropping the rest.")
+                    break
+                if first_chunk_at is None:
+                    first_chunk_at = time.time()
+                    info(f"Conversation: first Ollama tokens after {first_chunk_at - started:.2f}s")
+                reply_parts.append(delta)
+                pending += delta
+                *sentences, pending = _SENTENCE_END_RE.split(pending)
+                for sentence in sentences:
+                    if stop_event.is_set():
+                        break
+                    self._speak_sentence(sentence)
+            else:
+                # Speak whatever trails the last sentence boundary
+                if not stop_event.is_set():
+                    self._speak_sentence(pending)
+                    completed = True
         except Exception as e:
             elapsed = time.time() - started
             error(f"Conversation: error while querying LLM after {elapsed:.2f}s: {e}")
             return
 
         elapsed = time.time() - started
-        info(f"Conversation: Ollama returned in {elapsed:.2f}s")
-
-        # Log raw response details (type + repr snippet) to debug unexpected return shapes
-        try:
-            rtype = type(response).__name__
-            rrepr = repr(response)
-            if len(rrepr) > 800:
-                rrepr = rrepr[:800] + "…"
-            info(f"Conversation: Ollama raw response type={rtype} repr={rrepr}")
-        except Exception as e:
-            warning(f"Conversation: failed to log raw Ollama response: {e}")
-
-        if response is None:
-            warning("Conversation: Ollama response is None.")
+        if not completed:
+            # A cut-off reply would poison later turns, so keep it out of the chat
+            warning(f"Conversation: reply interrupted after {elapsed:.2f}s, not adding it to chat history.")
             return
+        info(f"Conversation: Ollama finished streaming in {elapsed:.2f}s")
 
-        # Some wrappers might return empty strings or objects with empty content
-        if isinstance(response, str):
-            reply_text = response.strip()
-        else:
-            reply_text = getattr(response, "content", None)
-            if reply_text is None:
-                reply_text = str(response)
-            reply_text = (reply_text or "").strip()
-
+        reply_text = "".join(reply_parts).strip()
         if not reply_text:
             warning("Conversation: empty response text after parsing Ollama response.")
             return
 
         # Log the parsed reply text (truncated) for debugging
-        try:
-            snippet = reply_text.replace("\n", " ")
-            if len(snippet) > 300:
-                snippet = snippet[:300] + "…"
-            info(f"Conversation: parsed reply_text_len={len(reply_text)} snippet='{snippet}'")
-        except Exception as e:
-            warning(f"Conversation: failed to log parsed reply snippet: {e}")
+        if self._debug_llm:
+            try:
+                snippet = reply_text.replace("\n", " ")
+                if len(snippet) > 300:
+                    snippet = snippet[:300] + "…"
+                info(f"Conversation: parsed reply_text_len={len(reply_text)} snippet='{snippet}'")
+            except Exception as e:
+                warning(f"Conversation: failed to log parsed reply snippet: {e}")
 
         # Append assistant reply and track for echo suppression
-        self._chat_messages.append({"role": "assistant", "content": reply_text})
+        with self._chat_lock:
+            self._chat_messages.append({"role": "assistant", "content": reply_text})
+            self._trim_chat_history()
         self._last_assistant_reply = reply_text
 
-        # Speak the reply
+        # After TTS ends, enter a short quiet window to recalibrate baseline
+        self._quiet_until_ts = max(time.time(), self._speaking_until or 0.0) + POST_TTS_QUIET_SEC
+        info(f"Conversation: entering adaptive quiet window for {POST_TTS_QUIET_SEC:.1f}s after TTS")
+
+    def _speak_sentence(self, sentence: str) -> None:
+        """Sanitize one sentence of an LLM reply and queue it for TTS."""
         # Some models include special tokens like </start_of_turn>. Strip common tag-like tokens
         # so macOS `say` receives clean natural language.
-        cleaned_reply = reply_text
+        cleaned = sentence
         try:
-            cleaned_reply = re.sub(r"</?start_of_turn>|</?end_of_turn>", "", cleaned_reply)
-            cleaned_reply = re.sub(r"<\|[^>]*\|>", "", cleaned_reply)  # e.g., <|endoftext|>
-            cleaned_reply = cleaned_reply.replace("\u0000", "")
-            cleaned_reply = cleaned_reply.strip()
+            cleaned = _TAG_RE.sub("", cleaned).replace("\u0000", "").strip()
         except Exception as e:
             warning(f"Conversation: failed to sanitize reply text: {e}")
-            cleaned_reply = reply_text
+            cleaned = sentence.strip()
+
+        if not cleaned:
+            return
 
         info(
-            f"Conversation: speaking reply len={len(cleaned_reply)} rate={self._speech_rate} preview={cleaned_reply[:120]!r}"
+            f"Conversation: speaking sentence len={len(cleaned)} rate={self._speech_rate} preview={cleaned[:120]!r}"
         )
-        self._speak(text=cleaned_reply, rate=self._speech_rate)
+        self._queue_speech(cleaned, self._speech_rate)
+
+    def _append_utterance(self, audio: np.ndarray) -> None:
+        """Copy a chunk into the utterance buffer, dropping anything past MAX_UTTERANCE_SEC."""
+        start = self._utt_len
+        room = self._utt_buf.size - start
+        n = audio.size
+        if n > room:
+            if room > 0:
+                warning(f"Conversation: utterance exceeds {MAX_UTTERANCE_SEC:.0f}s, dropping extra audio.")
+            n = room
+        if n > 0:
+            self._utt_buf[start:start + n] = audio[:n]
+            self._utt_len = start + n
+
+    def _discard_speculative(self) -> None:
+        """Drop a speculative transcript that no longer matches the utterance."""
+        if self._spec_future is not None:
+            self._spec_future.cancel()
+            self._spec_future = None
+
+    def _finish_transcription(self, utt: np.ndarray) -> Optional[str]:
+        """Return the transcript for utt, reusing the speculative run when it covers the same audio."""
+        future = self._spec_future
+        self._spec_future = None
+        if future is None or self._spec_len != utt.size or future.cancelled():
+            if future is not None:
+                future.cancel()
+            future = self._stt_executor.submit(transcribe, utt)
+        else:
+            info("Conversation: using speculative transcript")
+        try:
+            return future.result()
+        except Exception as e:
+            error(f"Conversation: transcription failed: {e}")
+            return None
 
-        # After TTS ends, enter a short quiet window to recalibrate baseline
-        quiet_duration = 0.2
-        self._quiet_until_ts = time.time() + quiet_duration
-        info(f"Conversation: entering adaptive quiet window for {quiet_duration:.1f}s")
+    def _audio_callback(self, audio_q: queue.Queue, indata, frames, time_info, status) -> None:
+        """PortAudio callback: copy the chunk onto this conversation's queue and return.
 
-    def _audio_callback(self, indata, frames, time_info, status) -> None:
-        """Audio callback that uses Silero VAD to segment speech and trigger transcription."""
+        VAD, accumulation and transcription run on the conversation thread
+        (see _process_audio_chunk) so slow work never stalls the stream.
+        """
         if status:
             info(f"Conversation audio callback status: {status}")
 
-        # Mono float32
-        audio = indata.mean(axis=1) if indata.ndim > 1 else indata
-        if audio.dtype != np.float32:
-            audio = audio.astype(np.float32, copy=False)
-
-        # Compute RMS and current time
-        rms = float(np.sqrt(np.mean(audio ** 2))) if audio.size else 0.0
-        now_ts = time.time()
-
-        # If the macOS 'say' TTS process is active, completely ignore this chunk
-        # for VAD and transcription. This keeps our own voice from becoming an
-        # utterance, without relying on an estimated speaking duration.
+        # While our own TTS is expected to be playing, completely ignore this
+        # chunk for VAD and transcription. This keeps our own voice from
+        # becoming an utterance. Checked here so queued chunks are judged by
+        # when they were captured, not when they are processed.
         if self._tts_is_active():
-            info("Conversation audio callback: ignored chunk while 'say' TTS process is active.")
+            info("Conversation audio callback: ignored chunk while TTS is active.")
             return
 
-        effective_gate = self._current_rms_gate()
-
-        # During the post-TTS quiet window, force silence and keep adapting the baseline
-        if now_ts < self._quiet_until_ts:
+        # The stream is opened with channels=1 and dtype="float32", so indata is
+        # always a (frames, 1) float32 block: copy column 0 as a contiguous 1-D
+        # array (PortAudio reuses indata after we return).
+        try:
+            audio_q.put_nowait((indata[:, 0].copy(), time.time()))
+        except queue.Full:
+            warning("Conversation audio callback: audio queue full, dropping chunk.")
+
+    @staticmethod
+    def _zero_crossing_rate(audio: np.ndarray) -> float:
+        """Return the fraction of adjacent samples whose sign differs."""
+        if audio.size < 2:
+            return 0.0
+        signs = np.signbit(audio)
+        return np.count_nonzero(signs[1:] != signs[:-1]) / (audio.size - 1)
+
+    def _process_audio_chunk(self, audio: np.ndarray, now_ts: float, stop_event: threading.Event) -> None:
+        """Use Silero VAD to segment speech in one chunk and trigger transcription."""
+        rms = audio_rms(audio)
+
+        effective_gate = self._rms_gate
+        audio_tensor = None
+
+        # During the post-TTS quiet window, or if energy is below the effective
+        # gate, treat as silence and keep adapting the baseline
+        if now_ts < self._quiet_until_ts or rms < effective_gate:
             self._update_rms_baseline(rms)
             speech_timestamps = []
-        # If energy is below the effective gate, treat as silence and adapt baseline
-        elif rms < effective_gate:
-            self._update_rms_baseline(rms)
+        elif (
+            not self._in_speech
+            and rms < effective_gate * PREFILTER_STRONG_GATE_MULT
+            and self._zero_crossing_rate(audio) < PREFILTER_ZCR_MIN
+        ):
+            # Marginal energy with speech-unlike spectrum: skip Silero
             speech_timestamps = []
         else:
             # Energy above gate: run VAD on this chunk
-            audio_tensor = torch.from_numpy((audio * 32768).astype(np.int16))
-            speech_timestamps = get_speech_timestamps(
-                audio_tensor,
-                self._vad_model,
-                return_seconds=True,
-                threshold=VAD_THRESHOLD,
-                min_speech_duration_ms=VAD_MIN_SPEECH_MS,
-                min_silence_duration_ms=VAD_MIN_SILENCE_MS,
-                speech_pad_ms=SPEECH_PADDING_MS,
+            # Silero expects float32 in [-1, 1], which is what the stream delivers
+            vad_model = self._vad_model or self._load_vad_model()
+            audio_tensor = self._torch.from_numpy(audio)
+            with self._vad_infer_lock, self._torch.inference_mode():
+                speech_timestamps = self._get_speech_timestamps(audio_tensor, vad_model, **_VAD_KWARGS)
+
+        self._vad_chunks_seen += 1
+        if audio_tensor is None:
+            self._vad_chunks_skipped += 1
+        if self._vad_chunks_seen % VAD_STATS_LOG_EVERY == 0:
+            skip_ratio = self._vad_chunks_skipped / self._vad_chunks_seen
+            info(
+                f"Conversation: RMS pre-filter skipped {self._vad_chunks_skipped}/{self._vad_chunks_seen} "
+                f"chunks ({skip_ratio:.0%}), gate={effective_gate:.4f}"
             )
 
         speech_detected = len(speech_timestamps) > 0
@@ -782,46 +1061,63 @@ class EngagementController:
             if not self._in_speech:
                 self._in_speech = True
                 info("Conversation: speech started")
-                self._current_utt = np.array([], dtype=np.float32)
-            # Any detected speech cancels a pending end
+                self._utt_len = 0
+            # Any detected speech cancels a pending end and its speculative transcript
             self._pending_end_ts = None
+            self._discard_speculative()
             # When speech is detected, accumulate the current audio chunk
-            if self._current_utt.size:
-                self._current_utt = np.concatenate((self._current_utt, audio))
-            else:
-                self._current_utt = audio.copy()
+            self._append_utterance(audio)
         else:
             if self._in_speech:
                 if self._pending_end_ts is None:
                     # First silent frame after speech: start the end confirmation timer
+                    # and start transcribing what we have in the meantime
                     self._pending_end_ts = now_ts
+                    if self._utt_len >= self._min_utt_samples:
+                        self._spec_len = self._utt_len
+                        self._spec_future = self._stt_executor.submit(
+                            transcribe, self._utt_buf[:self._utt_len].copy()
+                        )
                 else:
                     # If we have stayed silent long enough, finalize the utterance
                     if (now_ts - self._pending_end_ts) >= END_SILENCE_CONFIRM_SEC:
                         self._in_speech = False
                         self._pending_end_ts = None
                         info("Conversation: speech ended")
-                        utt = self._current_utt if self._current_utt.size else np.array([], dtype=np.float32)
-                        self._current_utt = np.array([], dtype=np.float32)
+                        utt = self._utt_buf[:self._utt_len].copy()
+                        self._utt_len = 0
                         if utt.size > 0:
-                            utt_dur_sec = float(utt.size) / float(SAMPLE_RATE)
-                            if utt_dur_sec < MIN_UTTERANCE_SEC:
-                                warning(f"TRANSCRIPT: [ignored short utterance {utt_dur_sec*1000:.0f} ms]")
+                            if utt.size < self._min_utt_samples:
+                                warning(f"TRANSCRIPT: [ignored short utterance {utt.size * 1000 // SAMPLE_RATE} ms]")
                             else:
-                                transcript = transcribe(utt)
-                                self._process_transcript(transcript)
+                                if stop_event.is_set():
+                                    return
+                                transcript = self._finish_transcription(utt)
+                                if stop_event.is_set():
+                                    info("Conversation: stopped during transcription, dropping transcript.")
+                                    return
+                                self._process_transcript(transcript, stop_event)
                         else:
                             warning("Conversation: no audio to process at end of speech.")
             # If we're already not in_speech, do nothing
 
-    def _conversation_loop(self) -> None:
+    def _conversation_loop(
+        self,
+        stop_event: threading.Event,
+        audio_q: queue.Queue,
+        previous: Optional[threading.Thread] = None,
+    ) -> None:
         """Stream audio from the mic, use VAD to detect speech, and drive the LLM."""
+        if previous is not None:
+            # Let the last conversation finish its turn before touching shared state
+            previous.join()
+            if stop_event.is_set():
+                return
         info("Conversation loop running (ENGAGED state, VAD-based).")
         # Ensure we have a system prompt at the front of the chat history
-        if not self._chat_messages or self._chat_messages[0].get("role") != "system":
-            system_prompt = self._personality_cfg.get("systemPrompt", "") if hasattr(self, "_personality_cfg") else ""
-            if system_prompt:
-                self._chat_messages.insert(0, {"role": "system", "content": system_prompt})
+        with self._chat_lock:
+            if self._initial_chat and (not self._chat_messages or self._chat_messages[0].get("role") != "system"):
+                self._chat_messages.insert(0, self._initial_chat[0])
 
         # Use personality speed if available, otherwise default to 80
         default_rate = 80
@@ -831,17 +1127,28 @@ class EngagementController:
             rate = default_rate
         self._speech_rate = rate
 
-        # Open an InputStream and let the callback handle VAD + conversation
+        # Start from a clean utterance; a previous conversation may have
+        # stopped mid-speech
+        self._in_speech = False
+        self._utt_len = 0
+        self._pending_end_ts = None
+        self._discard_speculative()
+
+        # Open an InputStream; the callback queues audio for this thread
         try:
             with sd.InputStream(
                 channels=1,
                 samplerate=SAMPLE_RATE,
                 blocksize=BUFFER_SIZE,
-                callback=self._audio_callback,
+                callback=partial(self._audio_callback, audio_q),
                 dtype="float32",
             ):
-                while not self._conversation_stop_event.is_set():
-                    time.sleep(0.1)
+                # The callback only queues chunks; process them here until stopped
+                while True:
+                    item = audio_q.get()
+                    if item is None or stop_event.is_set():
+                        break
+                    self._process_audio_chunk(*item, stop_event)
         except Exception as e:
             error(f"Conversation loop error: {e}")
 
@@ -1,6 +1,6 @@
 import threading
 import time
-from typing import Sequence, Optional
+from typing import Final, Sequence, Optional
 import random
 
 from util.logger import info, warning, error
@@ -9,6 +9,27 @@ from .led.led_state import LEDAddress
 from .motor.motor_controller import MotorController
 from .motor.motor_state import MotorAddress
 
+# Mapping from LED address to corresponding motor address
+_LED_TO_MOTOR: Final[dict[LEDAddress, MotorAddress]] = {
+    "A1": "B1",
+    "A2": "B2",
+    "A3": "B3",
+    "B0": "B1",
+    "C0": "C1",
+    "D0": "D1",
+    "E0": "E1",
+    "B4": "B3",
+    "C4": "C3",
+    "D4": "D3",
+    "E4": "E3",
+    "F1": "E1",
+    "F2": "E2",
+    "F3": "E3",
+}
+
+# Directions a motor may be moved in during the engaged phase
+_DIRECTIONS: Final[tuple[str, ...]] = ("CW", "CCW")
+
 class EngagedSequence:
     """Engaged animation where LEDs sparkle and mapped motors move in response.
 
@@ -67,12 +88,15 @@ class EngagedSequence:
         self.max_brightness = max_brightness
         self.min_brightness = min_brightness
 
+        # Time from the start of a fade in until the fade out, in seconds
+        self._fade_hold_s: float = (fade_in_ms + hold_ms) / 1000.0
+
         self._thread: Optional[threading.Thread] = None
         self._stop_event = threading.Event()
         self._running = False
 
         # Cache the list of LED addresses known to the controller
-        self._addresses: list[LEDAddress] = list(self.led_controller.leds.keys())
+        self._addresses: tuple[LEDAddress, ...] = tuple(self.led_controller.leds)
 
         if not self._addresses:
             warning("EngagedSequence created with no LED addresses")
@@ -80,11 +104,11 @@ class EngagedSequence:
         # Build a continuous path that runs around the perimeter:
         # left side (top to bottom), top row, right side (top to bottom),
         # then back along the bottom.
-        self._path: list[LEDAddress] = (
-            self.left_side
-            + self.top_row
-            + self.right_side
-            + list(reversed(self.bottom_row))
+        self._path: tuple[LEDAddress, ...] = (
+            tuple(self.left_side)
+            + tuple(self.top_row)
+            + tuple(self.right_side)
+            + tuple(reversed(self.bottom_row))
         )
 
         if not self._path:
@@ -95,23 +119,8 @@ class EngagedSequence:
         self._steps_per_move: int = 100
         self._move_time_ms: int = 1000
 
-        # Mapping from LED address to corresponding motor address
-        self._led_to_motor: dict[LEDAddress, MotorAddress] = {
-            "A1": "B1",
-            "A2": "B2",
-            "A3": "B3",
-            "B0": "B1",
-            "C0": "C1",
-            "D0": "D1",
-            "E0": "E1",
-            "B4": "B3",
-            "C4": "C3",
-            "D4": "D3",
-            "E4": "E3",
-            "F1": "E1",
-            "F2": "E2",
-            "F3": "E3"
-        }
+        # Instance RNG so sparkle picks do not go through the module-level random functions
+        self._rng = random.Random()
 
         # Motor scheduling: stagger slow 5–15 second movements so mapped motors do not move at once
         self._motor_next_move: dict[MotorAddress, float] = {}
@@ -122,7 +131,7 @@ class EngagedSequence:
             now = time.monotonic()
             for motor_addr in self.motor_controller.motors.keys():
                 # Stagger initial moves randomly within the maximum window
-                delay = random.uniform(0.0, self._max_motor_move_s)
+                delay = self._rng.uniform(0.0, self._max_motor_move_s)
                 self._motor_next_move[motor_addr] = now + delay
 
     def start(self) -> None:
@@ -177,7 +186,7 @@ class EngagedSequence:
 
         now = time.monotonic()
         for addr in addrs:
-            motor_addr = self._led_to_motor.get(addr)
+            motor_addr = _LED_TO_MOTOR.get(addr)
             if motor_addr is None:
                 continue
             if motor_addr not in self.motor_controller.motors:
@@ -188,9 +197,9 @@ class EngagedSequence:
                 continue
 
             # Choose a random duration between the configured min and max
-            duration_s = random.uniform(self._min_motor_move_s, self._max_motor_move_s)
+            duration_s = self._rng.uniform(self._min_motor_move_s, self._max_motor_move_s)
             duration_ms = int(duration_s * 1000)
-            direction = random.choice(["CW", "CCW"])
+            direction = self._rng.choice(_DIRECTIONS)
 
             info(
                 f"EngagedSequence: LED {addr} mapped to motor {motor_addr}, "
@@ -208,7 +217,7 @@ class EngagedSequence:
                 warning(f"EngagedSequence: error issuing move_to for motor {motor_addr}: {e}")
 
             # Schedule the next move for this motor after this one finishes, plus a random pause
-            pause_s = random.uniform(self._min_motor_move_s, self._max_motor_move_s)
+            pause_s = self._rng.uniform(self._min_motor_move_s, self._max_motor_move_s)
             self._motor_next_move[motor_addr] = now + duration_s + pause_s
 
     def _run_loop(self) -> None:
@@ -224,50 +233,41 @@ class EngagedSequence:
                 warning("Engaged sequence run loop has empty path, exiting")
                 return
 
+            set_brightness_batch = self.led_controller.set_brightness_batch
+
             while not self._stop_event.is_set():
                 # Sparkle effect: pick 2–3 random LEDs from the path
                 if not self._path:
                     continue
 
-                num_leds = min(len(self._path), random.randint(2, 3))
+                num_leds = min(len(self._path), self._rng.randrange(2, 4))
                 try:
-                    addrs = random.sample(self._path, num_leds)
+                    addrs = self._rng.sample(self._path, num_leds)
                 except ValueError:
                     # Fallback if sample fails for some reason
-                    addrs = [random.choice(self._path)]
+                    addrs = [self._rng.choice(self._path)]
 
                 # Drive motors corresponding to the LEDs that are about to turn on
                 self._drive_motors_for_leds(addrs)
 
                 # 1. Fade IN on the selected LEDs
-                for addr in addrs:
-                    try:
-                        self.led_controller.set_brightness(addr, self.max_brightness, self.fade_in_ms)
-                    except KeyError:
-                        warning(f"Engaged sequence tried to set unknown LED {addr}")
-                        continue
-                    except Exception as e:
-                        error(f"Engaged sequence error while setting {addr} during fade in: {e}")
-                        # Do not break the whole cycle; continue with other LEDs
-                        continue
-
-                # Wait for fade in and hold
-                time.sleep(self.fade_in_ms / 1000.0)
-                time.sleep(self.hold_ms / 1000.0)
+                try:
+                    set_brightness_batch(addrs, self.max_brightness, self.fade_in_ms)
+                except Exception as e:
+                    error(f"Engaged sequence error while setting {addrs} during fade in: {e}")
+
+                # Wait for fade in and hold; on stop, still fade out below
+                self._stop_event.wait(self._fade_hold_s)
 
                 # 2. Fade OUT on the same LEDs
-                for addr in addrs:
-                    try:
-                        self.led_controller.set_brightness(addr, self.min_brightness, self.fade_out_ms)
-                    except Exception as e:
-                        error(f"Engaged sequence error while setting {addr} during fade out: {e}")
+                try:
+                    set_brightness_batch(addrs, self.min_brightness, self.fade_out_ms)
+                except Exception as e:
+                    error(f"Engaged sequence error while setting {addrs} during fade out: {e}")
 
                 # 3. Tempo between sparkles
-                elapsed = 0.0
-                while elapsed < self.next_led_delay and not self._stop_event.is_set():
-                    chunk = min(0.05, self.next_led_delay - elapsed)
-                    time.sleep(chunk)
-                    elapsed += chunk
+                if self._stop_event.wait(self.next_led_delay):
+                    break
 
         except Exception as e:
             # Catch any unexpected exceptions to avoid killing the daemon thread silently
@@ -3,11 +3,19 @@ import os
 import sys
 import json
 import time
-import glob
 import serial
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from util.logger import info, warning, error
 from hw.radar_reader import RadarReader
 
+# /dev name prefixes of USB serial ports that can be one of our boards. On
+# macOS: CDC-ACM, FTDI/CP210x and CH34x nodes. On Linux: ACM and USB ttys.
+_PORT_PREFIXES = (
+    ("cu.usbmodem", "cu.usbserial", "cu.wchusbserial")
+    if sys.platform == "darwin"
+    else ("ttyACM", "ttyUSB")
+)
+
 
 class HWState:
     """
@@ -22,7 +30,12 @@ class HWState:
 
     BAUD_RATE = 115200
 
+    # Discovery: per-attempt NAME read timeout, and total time a board gets to boot
+    PROBE_READ_TIMEOUT = 0.2
+    PROBE_BOOT_TIMEOUT = 2.5
+
     _instance = None
+    _initialized = False
     _lock = threading.Lock()
 
     # Valid state machine labels
@@ -32,31 +45,41 @@ class HWState:
     LEAVING = "LEAVING"
 
     def __new__(cls):
+        # Fast path: once constructed, the instance never changes
+        if cls._instance is not None:
+            return cls._instance
         with cls._lock:
             if cls._instance is None:
-                cls._instance = super().__new__(cls)
-                cls._instance._initialized = False
+                # Publish only a fully set up object to the unlocked fast path
+                instance = super().__new__(cls)
+                instance._initialized = False
+                cls._instance = instance
         return cls._instance
 
     def __init__(self):
-        # Prevent __init__ from running twice
+        # Prevent __init__ from running twice (checked again under the lock)
         if self._initialized:
             return
 
-        # Storage for serial devices
-        self.led_serials = {}       # dict[str, serial.Serial]
-        self.motor_serials = {}     # dict[str, serial.Serial]
-        self.radar_serial = None    # serial.Serial or None
-        self.radar_reader = None    # RadarReader or None
+        with self._lock:
+            if self._initialized:
+                return
+
+            # Storage for serial devices
+            self.led_serials = {}       # dict[str, serial.Serial]
+            self.motor_serials = {}     # dict[str, serial.Serial]
+            self.radar_serial = None    # serial.Serial or None
+            self.radar_reader = None    # RadarReader or None
 
-        # Hardware map loaded from hwMap.json
-        self.hw_map = []            # list[dict]
+            # Hardware map loaded from hwMap.json
+            self.hw_map = []            # list[dict]
+            self._hw_map_by_name = {}   # dict[str, dict], built by load_hw_map
 
-        # State machine
-        self._state = HWState.IDLE
+            # State machine
+            self._state = HWState.IDLE
 
-        self._initialized = True
-        info("HWState initialized with state IDLE")
+            self._initialized = True
+            info("HWState initialized with state IDLE")
 
     def load_hw_map(self):
         """Load hwMap.json to understand the peripheral devices connected."""
@@ -77,92 +100,62 @@ class HWState:
             error("hwMap.json must contain a top level JSON array")
             sys.exit(1)
 
+        # Index entries by board_name; keep the first entry for duplicate names
+        self._hw_map_by_name = {}
+        for entry in self.hw_map:
+            self._hw_map_by_name.setdefault(entry.get("board_name"), entry)
+
         info(f"Loaded hwMap.json with {len(self.hw_map)} entries.")
 
     def connect_peripherals(self):
-        """Probe all /dev/cu.usb* devices, send NAME, and update hw_map.
+        """Probe all USB serial devices, send NAME, and update hw_map.
 
         Returns a dict mapping board_name -> open serial connection for
         light boards only.
         """
         info("Auto discovering boards")
 
-        potential_ports = glob.glob("/dev/cu.usb*")
+        potential_ports = self._candidate_ports()
         if not potential_ports:
-            error("No USB devices found matching /dev/cu.usb*")
+            error("No USB serial devices found in /dev")
             return {}
 
         info(f"Found {len(potential_ports)} candidate device(s). Probing...")
 
         board_serials = {}
 
-        for port in potential_ports:
-            info(f"Probing {port}...")
-            try:
-                s = serial.Serial(port, self.BAUD_RATE, timeout=2, write_timeout=1)
-            except serial.SerialException as e:
-                error(f"Failed to open {port}: {e}")
-                continue
-            except Exception as e:
-                error(f"Unexpected error opening {port}: {e}")
-                continue
-
-            # Give the board a moment to boot and clear any noise
-            time.sleep(2)
-            s.reset_input_buffer()
-
-            # Ask for NAME with clean timeout handling
-            try:
-                s.write(b"NAME\r\n")
-            except serial.SerialTimeoutException as e:
-                error(f"Write timeout when sending NAME to {port}: {e}")
-                s.close()
-                continue
-            except Exception as e:
-                error(f"Error sending NAME to {port}: {e}")
-                s.close()
-                continue
-
-            try:
-                response = s.readline().decode("ascii", errors="ignore").strip()
-            except Exception as e:
-                error(f"Error reading NAME response from {port}: {e}")
-                s.close()
-                continue
-
-            if not response:
-                warning(f"No NAME response from {port} (timeout or empty)")
-                s.close()
-                continue
-
-            hw_entry = self.find_hw_entry_by_name(response)
-            if hw_entry is None:
-                warning(f"Unrecognized device. NAME='{response}' on {port}")
-                s.close()
-                continue
-
-            # We have a known board. Update its port in the hw map.
-            hw_entry["port"] = port
-
-            info(
-                f"Matched board '{response}' to {port} "
-                f"(type={hw_entry.get('type', 'unknown')})"
-            )
-
-            device_type = hw_entry.get("type")
-
-            if device_type == "light":
-                board_serials[response] = s
-                self.register_led_serial(response, s)
-            elif device_type == "motor":
-                board_serials[response] = s
-                self.register_motor_serial(response, s)
-            elif device_type == "radar":
-                board_serials[response] = s
-                self.register_radar_serial(response, s)
-            else:
-                warning(f"Unknown board type '{device_type}' for board '{response}'")
-                s.close()
+        # Each probe mostly waits on its own port, so run them side by side and
+        # register the results on this thread as they finish
+        with ThreadPoolExecutor(max_workers=len(potential_ports)) as ex:
+            futures = [ex.submit(self._probe_port, port) for port in potential_ports]
+            for future in as_completed(futures):
+                result = future.result()
+                if result is None:
+                    continue
+                response, port, s, hw_entry = result
+
+                # We have a known board. Update its port in the hw map.
+                hw_entry["port"] = port
+
+                info(
+                    f"Matched board '{response}' to {port} "
+                    f"(type={hw_entry.get('type', 'unknown')})"
+                )
+
+                device_type = hw_entry.get("type")
+
+                if device_type == "light":
+                    board_serials[response] = s
+                    self.register_led_serial(response, s)
+                elif device_type == "motor":
+                    board_serials[response] = s
+                    self.register_motor_serial(response, s)
+                elif device_type == "radar":
+                    board_serials[response] = s
+                    self.register_radar_serial(response, s)
+                else:
+                    warning(f"Unknown board type '{device_type}' for board '{response}'")
+                    s.close()
 
         # Log any boards from hwMap.json that did not get a port assigned
         missing = [e["board_name"] for e in self.hw_map if e.get("port") in (None, "")]
@@ -175,6 +168,101 @@ class HWState:
 
         return board_serials
     
+    @staticmethod
+    def _candidate_ports():
+        """Return /dev nodes that can plausibly be one of our boards.
+
+        On macOS these are cu.usbmodem*, cu.usbserial* and cu.wchusbserial*,
+        minus Bluetooth nodes that never answer. On Linux they are ttyACM* and
+        ttyUSB*.
+        """
+        try:
+            with os.scandir("/dev") as entries:
+                return sorted(
+                    e.path
+                    for e in entries
+                    if e.name.startswith(_PORT_PREFIXES) and "bluetooth" not in e.name.lower()
+                )
+        except OSError as e:
+            error(f"Could not list /dev: {e}")
+            return []
+
+    def _probe_port(self, port):
+        """Open port, ask the board for its NAME, and match it against hwMap.
+
+        Returns (name, port, serial, hw_entry) for a known board, or None after
+        closing the port.
+        """
+        info(f"Probing {port}...")
+        try:
+            s = serial.Serial(port, self.BAUD_RATE, timeout=self.PROBE_READ_TIMEOUT, write_timeout=1)
+        except serial.SerialException as e:
+            error(f"Failed to open {port}: {e}")
+            return None
+        except Exception as e:
+            error(f"Unexpected error opening {port}: {e}")
+            return None
+
+        # Boards may still be booting after the port opens (and print READY when
+        # done), so keep asking for NAME until a known board answers or we give up
+        s.reset_input_buffer()
+        deadline = time.monotonic() + self.PROBE_BOOT_TIMEOUT
+        response = ""
+        hw_entry = None
+        try:
+            while hw_entry is None and time.monotonic() < deadline:
+                s.write(b"NAME\r\n")
+                # Filter as bytes; only a candidate name gets decoded
+                raw = s.readline().strip()
+                if not raw or raw == b"READY" or raw.startswith((b"ERR", b"OK")):
+                    continue
+                response = raw.decode("ascii", errors="ignore")
+                hw_entry = self.find_hw_entry_by_name(response)
+        except serial.SerialTimeoutException as e:
+            error(f"Write timeout when sending NAME to {port}: {e}")
+            s.close()
+            return None
+        except Exception as e:
+            error(f"Error probing NAME on {port}: {e}")
+            s.close()
+            return None
+
+        if hw_entry is None:
+            if response:
+                warning(f"Unrecognized device. NAME='{response}' on {port}")
+            else:
+                warning(f"No NAME response from {port} (timeout or empty)")
+            s.close()
+            return None
+
+        # Drop replies to any NAME requests still in flight, then restore the
+        # normal read timeout used by the board's owner
+        time.sleep(self.PROBE_READ_TIMEOUT)
+        s.reset_input_buffer()
+        s.timeout = 2
+        self._apply_low_latency(s)
+
+        return response, port, s, hw_entry
+
+    @staticmethod
+    def _apply_low_latency(ser):
+        """Drop the FTDI latency timer to 1 ms for this port, where supported.
+
+        Only Linux exposes the timer (via sysfs, for usb-serial adapters such as
+        FTDI). CDC-ACM boards and macOS ports have no such knob, so this is a
+        no-op there. Failures, e.g. missing write permission, are only logged.
+        """
+        tty = os.path.basename(os.path.realpath(ser.port))
+        path = f"/sys/bus/usb-serial/devices/{tty}/latency_timer"
+        if not os.path.exists(path):
+            return
+        try:
+            with open(path, "w") as f:
+                f.write("1")
+            info(f"Set latency_timer=1 ms for {ser.port}")
+        except OSError as e:
+            warning(f"Could not lower latency_timer for {ser.port}: {e}")
+
     def register_led_serial(self, name, ser):
         """Register a serial connection belonging to an LED controller board."""
         self.led_serials[name] = ser
@@ -234,36 +322,33 @@ class HWState:
 
     def find_hw_entry_by_name(self, board_name):
         """Return the first hw map entry whose board_name matches, or None."""
-        for entry in self.hw_map:
-            if entry.get("board_name") == board_name:
-                return entry
-        return None
+        return self._hw_map_by_name.get(board_name)
 
     def disconnect_peripherals(self):
         """Close all registered serial devices."""
         # Ensure radar monitoring is stopped before closing serial ports
         self.stop_monitoring_radar()
 
-        for name, ser in list(self.led_serials.items()):
-            try:
-                if ser.is_open:
-                    ser.close()
-                info(f"Closed LED serial '{name}'")
-            except Exception as e:
-                error(f"Error closing LED serial '{name}': {e}")
-
-        for name, ser in list(self.motor_serials.items()):
-            try:
-                if ser.is_open:
-                    ser.close()
-                info(f"Closed motor serial '{name}'")
-            except Exception as e:
-                error(f"Error closing motor serial '{name}': {e}")
-
+        ports = [(f"LED serial '{name}'", ser) for name, ser in self.led_serials.items()]
+        ports += [(f"motor serial '{name}'", ser) for name, ser in self.motor_serials.items()]
         if self.radar_serial is not None:
-            try:
-                if self.radar_serial.is_open:
-                    self.radar_serial.close()
-                info("Closed radar serial")
-            except Exception as e:
-                error(f"Error closing radar serial: {e}")
+            ports.append(("radar serial", self.radar_serial))
+
+        # Closing a port can take a few hundred ms on macOS, so close them all at once
+        if ports:
+            with ThreadPoolExecutor(max_workers=min(len(ports), 8)) as ex:
+                list(ex.map(lambda p: self._safe_close(*p), ports))
+
+    @staticmethod
+    def _safe_close(label, ser):
+        """Close one serial port, first cancelling any blocked read or write."""
+        try:
+            if ser.is_open:
+                for cancel in ("cancel_read", "cancel_write"):
+                    # Not available on every platform/pyserial build
+                    if hasattr(ser, cancel):
+                        getattr(ser, cancel)()
+                ser.close()
+            info(f"Closed {label}")
+        except Exception as e:
+            error(f"Error closing {label}: {e}")
@@ -1,6 +1,5 @@
 import threading
-import time
-from typing import Sequence, Optional
+from typing import Final, Sequence, Optional
 
 from util.logger import info, warning, error
 from .led.led_controller import LEDController
@@ -8,6 +7,18 @@ from .led.led_state import LEDAddress
 from .motor.motor_controller import MotorController
 from .motor.motor_state import MotorAddress
 
+# Mapping from LED address to corresponding motor address
+_LED_TO_MOTOR: Final[dict[LEDAddress, MotorAddress]] = {
+    "B0": "B1",
+    "C0": "C1",
+    "D0": "D1",
+    "E0": "E1",
+    "B4": "B3",
+    "C4": "C3",
+    "D4": "D3",
+    "E4": "E3",
+}
+
 class LeavingSequence:
     """Leaving animation that marches LEDs along the top and bottom rows.
 
@@ -60,18 +71,21 @@ class LeavingSequence:
         self.max_brightness = max_brightness
         self.min_brightness = min_brightness
 
+        # Time from the start of a fade in until the fade out, in seconds
+        self._fade_hold_s: float = (fade_in_ms + hold_ms) / 1000.0
+
         self._thread: Optional[threading.Thread] = None
         self._stop_event = threading.Event()
         self._running = False
 
         # Cache the list of LED addresses known to the controller
-        self._addresses: list[LEDAddress] = list(self.led_controller.leds.keys())
+        self._addresses: tuple[LEDAddress, ...] = tuple(self.led_controller.leds)
 
         if not self._addresses:
             warning("LeavingSequence created with no LED addresses")
 
         # Build a continuous path that runs along the top and back along the bottom
-        self._path: list[LEDAddress] = self.top_row + list(reversed(self.bottom_row))
+        self._path: tuple[LEDAddress, ...] = tuple(self.top_row) + tuple(reversed(self.bottom_row))
 
         if not self._path:
             warning("LeavingSequence created with an empty path")
@@ -82,18 +96,6 @@ class LeavingSequence:
         self._steps_per_move: int = 100
         self._move_time_ms: int = 1000
 
-        # Mapping from LED address to corresponding motor address
-        self._led_to_motor: dict[LEDAddress, MotorAddress] = {
-            "B0": "B1",
-            "C0": "C1",
-            "D0": "D1",
-            "E0": "E1",
-            "B4": "B3",
-            "C4": "C3",
-            "D4": "D3",
-            "E4": "E3",
-        }
-
     def start(self) -> None:
         """Start the leaving animation in a background thread."""
         if self._running:
@@ -137,7 +139,7 @@ class LeavingSequence:
         if self.motor_controller is None:
             return
 
-        motor_addr = self._led_to_motor.get(addr)
+        motor_addr = _LED_TO_MOTOR.get(addr)
         if motor_addr is None:
             return
 
@@ -175,6 +177,8 @@ class LeavingSequence:
                 warning("Leaving sequence run loop has empty path, exiting")
                 return
 
+            set_brightness = self.led_controller.set_brightness
+
             while not self._stop_event.is_set():
                 for addr in self._path:
                     if self._stop_event.is_set():
@@ -185,7 +189,7 @@ class LeavingSequence:
 
                     # 1. Fade IN
                     try:
-                        self.led_controller.set_brightness(addr, self.max_brightness, self.fade_in_ms)
+                        set_brightness(addr, self.max_brightness, self.fade_in_ms)
                     except KeyError:
                         warning(f"Leaving sequence tried to set unknown LED {addr}")
                         continue
@@ -193,22 +197,18 @@ class LeavingSequence:
                         error(f"Leaving sequence error while setting {addr} during fade in: {e}")
                         continue
 
-                    # Wait for fade in and hold
-                    time.sleep(self.fade_in_ms / 1000.0)
-                    time.sleep(self.hold_ms / 1000.0)
+                    # Wait for fade in and hold; on stop, still fade out below
+                    self._stop_event.wait(self._fade_hold_s)
 
                     # 2. Fade OUT
                     try:
-                        self.led_controller.set_brightness(addr, self.min_brightness, self.fade_out_ms)
+                        set_brightness(addr, self.min_brightness, self.fade_out_ms)
                     except Exception as e:
                         error(f"Leaving sequence error while setting {addr} during fade out: {e}")
 
                     # 3. Tempo between LEDs
-                    elapsed = 0.0
-                    while elapsed < self.next_led_delay and not self._stop_event.is_set():
-                        chunk = min(0.05, self.next_led_delay - elapsed)
-                        time.sleep(chunk)
-                        elapsed += chunk
+                    if self._stop_event.wait(self.next_led_delay):
+                        break
 
         except Exception as e:
             # Catch any unexpected exceptions to avoid killing the daemon thread silently
@@ -1,17 +1,25 @@
 from __future__ import annotations
 
+import queue
 import serial
-from typing import Dict
+from typing import Dict, Iterable, Union
 from .led_state import LEDState, LEDAddress
-from util.logger import info
+from util.logger import info, warning
 import threading
 
+# Items on a board's write queue: encoded commands, or an Event to set once
+# everything queued before it has been written (see flush)
+_WriteItem = Union[bytes, threading.Event]
+
 class LEDController:
     """Controller responsible for creating and managing all LEDState objects.
 
     The caller provides hwMap.json AND pre-opened serial interfaces for each
     board. The controller maps LED addresses to LEDState instances using the
     board's defined LED index.
+
+    Writes go through one queue and writer thread per board, so callers never
+    block on the serial port and boards do not contend with each other.
     """
 
     def __init__(self, hwmap: list, board_serials: Dict[str, serial.Serial]) -> None:
@@ -23,7 +31,7 @@ class LEDController:
 
         self.leds: Dict[LEDAddress, LEDState] = {}
         self.board_serials = board_serials
-        self._lock = threading.Lock()
+        self._board_queues: Dict[serial.Serial, "queue.SimpleQueue[_WriteItem]"] = {}
 
         info("Initializing LEDController")
 
@@ -41,6 +49,15 @@ class LEDController:
             info(f"Configuring light board {board_name}")
 
             ser = self.board_serials[board_name]
+            if ser not in self._board_queues:
+                q: "queue.SimpleQueue[_WriteItem]" = queue.SimpleQueue()
+                self._board_queues[ser] = q
+                threading.Thread(
+                    target=self._writer_loop,
+                    args=(board_name, ser, q),
+                    name=f"led-writer-{board_name}",
+                    daemon=True,
+                ).start()
 
             for addr_str, index in mapping.items():
                 addr: LEDAddress = addr_str
@@ -52,11 +69,78 @@ class LEDController:
     def set_brightness(self, address: LEDAddress, brightness: int, duration_ms: int) -> None:
         # info(f"Setting LED {address} to brightness {brightness} over {duration_ms} ms")
 
-        with self._lock:
-            if address not in self.leds:
-                raise KeyError(f"Unknown LED address: {address}")
+        led = self.leds.get(address)
+        if led is None:
+            raise KeyError(f"Unknown LED address: {address}")
+
+        led.apply_brightness(brightness, duration_ms)
+        self._enqueue(led.ser, led.command_bytes())
+
+    def set_brightness_batch(self, addresses: Iterable[LEDAddress], brightness: int, duration_ms: int) -> None:
+        """Set several LEDs to the same brightness with one serial write per board.
+
+        The firmware has no multi-LED command, so the SET lines for each board
+        are concatenated and written together. Unknown addresses are skipped.
+        """
+        per_board: Dict[serial.Serial, list[bytes]] = {}
+        for address in addresses:
+            led = self.leds.get(address)
+            if led is None:
+                warning(f"Unknown LED address in batch: {address}")
+                continue
+            led.apply_brightness(brightness, duration_ms)
+            per_board.setdefault(led.ser, []).append(led.command_bytes())
+
+        for ser, cmds in per_board.items():
+            self._enqueue(ser, b"".join(cmds))
 
-            self.leds[address].set_brightness(brightness, duration_ms)
+    def flush(self, timeout: float = 2.0) -> None:
+        """Block until every command queued so far has been written.
+
+        Call before closing the serial ports so final commands are not lost.
+        """
+        events = []
+        for q in self._board_queues.values():
+            ev = threading.Event()
+            q.put(ev)
+            events.append(ev)
+        for ev in events:
+            if not ev.wait(timeout):
+                warning("Timed out waiting for LED writes to flush")
+
+    def _enqueue(self, ser: serial.Serial, cmd: bytes) -> None:
+        q = self._board_queues.get(ser)
+        if q is not None:
+            q.put(cmd)
+
+    @staticmethod
+    def _writer_loop(board_name: str, ser: serial.Serial, q: "queue.SimpleQueue[_WriteItem]") -> None:
+        """Write queued commands for one board, coalescing any backlog into one write."""
+        # Bind the hot-path methods once for the life of the thread
+        get, get_nowait, write = q.get, q.get_nowait, ser.write
+        while True:
+            item = get()
+            cmds: list[bytes] = []
+            flushed: list[threading.Event] = []
+            while True:
+                if isinstance(item, threading.Event):
+                    flushed.append(item)
+                else:
+                    cmds.append(item)
+                try:
+                    item = get_nowait()
+                except queue.Empty:
+                    break
+
+            if cmds:
+                try:
+                    write(b"".join(cmds))
+                except Exception as e:
+                    # Hardware errors should not crash the writer thread
+                    warning(f"LED write to {board_name} failed: {e}")
+
+            for ev in flushed:
+                ev.set()
 
 
 __all__ = ["LEDController"]
@@ -3,7 +3,9 @@ from typing import List
 import serial
 from typing import Literal, Optional
 import time
-import threading
+from functools import lru_cache
+
+from util.scheduler import schedule
 
 ALL_ADDRESSES: List[str] = [
     "A1", "A2", "A3",
@@ -16,6 +18,13 @@ ALL_ADDRESSES: List[str] = [
 
 LEDAddress = str
 
+
+@lru_cache(maxsize=4096)
+def _led_cmd(index: int, value: int, duration: int) -> bytes:
+    """Encoded SET command; fades repeat the same few tuples constantly."""
+    return b"SET %d %d %d\r\n" % (index, value, duration)
+
+
 class LEDState:
     def __init__(self, address: LEDAddress, ser: serial.Serial, index: int) -> None:
         self.address = address
@@ -35,6 +44,15 @@ class LEDState:
         This method sends the command immediately and then schedules
         a status update after the fade duration has elapsed.
         """
+        self.apply_brightness(brightness, duration_ms)
+        self._send()
+
+    def apply_brightness(self, brightness: int, duration_ms: int) -> None:
+        """Update local state for a brightness change without sending it.
+
+        Used by LEDController, which queues the encoded command
+        (see command_bytes) on the board's writer thread.
+        """
         self.prev_brightness = self.brightness
         self.brightness = max(0, min(255, brightness))
         self.duration_ms = max(0, duration_ms)
@@ -44,20 +62,24 @@ class LEDState:
             self.start_at = time.time()
             self.end_at = self.start_at
             self.status = "on" if self.brightness > 0 else "off"
-            self._send()
             return
 
         # Fade case
         self.start_at = time.time()
         self.end_at = self.start_at + (self.duration_ms / 1000.0)
         self.status = "fading"
-        self._send()
 
         # Schedule a non-blocking callback to mark completion.
         def _finish():
             self.status = "on" if self.brightness > 0 else "off"
 
-        threading.Timer(self.duration_ms / 1000.0, _finish).start()
+        schedule(self.duration_ms / 1000.0, _finish)
+
+    def command_bytes(self) -> bytes:
+        """Return the SET command for the current state, encoded for the wire."""
+        value = max(0, min(255, int(self.brightness)))
+        duration = max(0, int(self.duration_ms))
+        return _led_cmd(self.index, value, duration)
 
     def _send(self) -> None:
         """Send the current state to the hardware over the attached serial port.
@@ -68,11 +90,8 @@ class LEDState:
         if not hasattr(self, "ser") or self.ser is None:
             return
 
-        value = max(0, min(255, int(self.brightness)))
-        duration = max(0, int(self.duration_ms))
-        cmd = f"SET {self.index} {value} {duration}\r\n"
         try:
-            self.ser.write(cmd.encode("ascii"))
+            self.ser.write(self.command_bytes())
         except Exception:
             # Hardware errors should not crash the controller loop
             pass
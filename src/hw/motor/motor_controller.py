@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import serial
-from typing import Dict
+from typing import Dict, Tuple
 from .motor_state import MotorState, MotorAddress
 from util.logger import info
 import threading
@@ -10,16 +10,20 @@ import time
 class MotorController:
     """Controller responsible for creating and managing all MotorState objects."""
 
-    # Minimum interval between commands to any motor, in seconds.
+    # Minimum interval between commands to motors on the same board, in seconds.
     # This helps prevent overrunning the motor firmware with back-to-back
-    # serial commands that are too close together.
+    # serial commands that are too close together. Separate boards have
+    # separate firmware, so they are throttled independently.
     _MIN_CMD_INTERVAL = 0.1
 
     def __init__(self, hwmap: list, board_serials: Dict[str, serial.Serial]) -> None:
         self.motors: Dict[MotorAddress, MotorState] = {}
         self.board_serials = board_serials
-        self._lock = threading.Lock()
-        self._last_cmd_time = 0.0
+        # Per-board lock and last-command time, keyed by serial port
+        self._board_locks: Dict[serial.Serial, threading.Lock] = {}
+        self._board_last: Dict[serial.Serial, float] = {}
+        # Last command sent to each motor and when, for dropping repeats
+        self._last_cmd: Dict[MotorAddress, Tuple[float, tuple]] = {}
 
         info("Initializing MotorController")
 
@@ -35,40 +39,67 @@ class MotorController:
 
             ser = self.board_serials[board_name]
             self.motors[address] = MotorState(address=address, ser=ser)
+            if ser not in self._board_locks:
+                self._board_locks[ser] = threading.Lock()
+                self._board_last[ser] = 0.0
             info(f"Mapped motor {address} on {board_name}")
 
         info(f"MotorController initialized with {len(self.motors)} motors")
 
-    def _throttle(self) -> None:
-        """Ensure a minimum interval between motor commands."""
+    def _motor(self, address: MotorAddress) -> MotorState:
+        motor = self.motors.get(address)
+        if motor is None:
+            raise KeyError(f"Unknown motor address: {address}")
+        return motor
+
+    def _is_repeat(self, address: MotorAddress, cmd: tuple) -> bool:
+        """Return True if cmd repeats the last command to address within the min interval.
+
+        Otherwise record cmd as the latest one. Caller must hold the board's lock.
+        """
+        now = time.monotonic()
+        last = self._last_cmd.get(address)
+        if last is not None and last[1] == cmd and now - last[0] < self._MIN_CMD_INTERVAL:
+            return True
+        self._last_cmd[address] = (now, cmd)
+        return False
+
+    def _throttle(self, ser: serial.Serial) -> None:
+        """Ensure a minimum interval between commands to one board.
+
+        Caller must hold that board's lock.
+        """
         now = time.monotonic()
-        delta = now - self._last_cmd_time
+        delta = now - self._board_last[ser]
         if delta < self._MIN_CMD_INTERVAL:
             sleep_time = self._MIN_CMD_INTERVAL - delta
             # Keep this log at info level for now so we can see when throttling occurs.
             info(f"MotorController: throttling commands for {sleep_time:.3f}s to respect min interval.")
             time.sleep(sleep_time)
-        self._last_cmd_time = time.monotonic()
+        self._board_last[ser] = time.monotonic()
 
     def rotate(self, address: MotorAddress, direction: str, rpm: int) -> None:
-        with self._lock:
-            if address not in self.motors:
-                raise KeyError(f"Unknown motor address: {address}")
-            self._throttle()
-            self.motors[address].rotate(direction, rpm)
+        motor = self._motor(address)
+        with self._board_locks[motor.ser]:
+            if self._is_repeat(address, ("rotate", direction, rpm)):
+                return
+            self._throttle(motor.ser)
+            motor.rotate(direction, rpm)
 
     def move_to(self, address: MotorAddress, direction: str, position: int, duration_ms: int) -> None:
-        with self._lock:
-            if address not in self.motors:
-                raise KeyError(f"Unknown motor address: {address}")
-            self._throttle()
-            self.motors[address].move_to(direction, position, duration_ms)
+        motor = self._motor(address)
+        with self._board_locks[motor.ser]:
+            if self._is_repeat(address, ("move_to", direction, position, duration_ms)):
+                return
+            self._throttle(motor.ser)
+            motor.move_to(direction, position, duration_ms)
 
     def stop(self, address: MotorAddress) -> None:
-        with self._lock:
-            if address not in self.motors:
-                raise KeyError(f"Unknown motor address: {address}")
-            self._throttle()
-            self.motors[address].stop()            
+        motor = self._motor(address)
+        with self._board_locks[motor.ser]:
+            if self._is_repeat(address, ("stop",)):
+                return
+            self._throttle(motor.ser)
+            motor.stop()
 
 __all__ = ["MotorController"]
@@ -2,7 +2,8 @@ from __future__ import annotations
 from typing import List, Literal, Optional
 import serial
 import time
-import threading
+
+from util.scheduler import schedule
 
 ALL_ADDRESSES: List[str] = [
     "B1", "C1", "D1", "E1",
@@ -12,6 +13,11 @@ ALL_ADDRESSES: List[str] = [
 
 MotorAddress = str
 
+# Pre-encoded command pieces; only the numeric arguments change per command
+_ROT_PREFIX = {"CW": b"ROT CW ", "CCW": b"ROT CCW "}
+_STP_PREFIX = {"CW": b"STP CW ", "CCW": b"STP CCW "}
+_STOP_CMD = b"STOP\r\n"
+
 class MotorState:
     """Track and control the state of a single motor over a serial connection.
 
@@ -110,7 +116,7 @@ class MotorState:
                 # When the move completes, consider the motor as stopped and holding position.
                 self.status = "stopped"
 
-            threading.Timer(self.duration_ms / 1000.0, _finish).start()
+            schedule(self.duration_ms / 1000.0, _finish)
         else:
             # Instant move, immediately mark as stopped.
             self.status = "stopped"
@@ -125,8 +131,8 @@ class MotorState:
             return
 
         rpm = max(1, min(100, int(self.rpm)))
-        cmd = f"ROT {self.direction} {rpm}\r\n"
-        self._write(cmd)
+        prefix = _ROT_PREFIX.get(self.direction) or f"ROT {self.direction} ".encode("ascii")
+        self._write(prefix + b"%d\r\n" % rpm)
 
     def _send_step(self) -> None:
         """Send the current step state as a STP command."""
@@ -137,21 +143,20 @@ class MotorState:
 
         pos = int(self.position)
         duration = max(0, int(self.duration_ms))
-        cmd = f"STP {self.direction} {pos} {duration}\r\n"
-        self._write(cmd)
+        prefix = _STP_PREFIX.get(self.direction) or f"STP {self.direction} ".encode("ascii")
+        self._write(prefix + b"%d %d\r\n" % (pos, duration))
 
     def _send_stop(self) -> None:
         """Send the stop signal as a STOP command"""
         if not hasattr(self, "ser") or self.ser is None:
             return
 
-        cmd = "STOP\r\n"
-        self._write(cmd)        
+        self._write(_STOP_CMD)
 
-    def _write(self, cmd: str) -> None:
+    def _write(self, cmd: bytes) -> None:
         """Low level write helper to protect the controller loop from errors."""
         try:
-            self.ser.write(cmd.encode("ascii"))
+            self.ser.write(cmd)
         except Exception:
             # Hardware errors should not crash the controller loop.
             pass
@@ -1,5 +1,5 @@
+import re
 import threading
-import time
 from typing import Optional
 
 import serial
@@ -9,6 +9,14 @@ from util.logger import info, warning, error
 
 RADAR_POLL_INTERVAL = 0.25  # seconds
 
+# Log one reading in every RADAR_LOG_EVERY, or sooner if the distance jumps
+RADAR_LOG_EVERY = 10
+RADAR_LOG_DIST_DELTA_MM = 100
+
+# "ts x y dist angle speed"; x, angle and speed can be negative
+_LINE_RE = re.compile(rb"^\s*(-?\d+)\s+(-?\d+)\s+(-?\d+)\s+(-?\d+)\s+(-?\d+)\s+(-?\d+)\s*$")
+_ALL_ZERO = (0, 0, 0, 0, 0, 0)
+
 
 class RadarReading:
     """Simple container for a single radar reading.
@@ -22,6 +30,8 @@ class RadarReading:
       speed: speed in cm/s
     """
 
+    __slots__ = ("timestamp_ms", "x_mm", "y_mm", "distance_mm", "angle_deg", "speed_cm_s")
+
     def __init__(self, ts: int, x: int, y: int, dist: int, angle: int, speed: int) -> None:
         self.timestamp_ms = ts
         self.x_mm = x
@@ -59,9 +69,16 @@ class RadarReader:
 
         self._latest: Optional[RadarReading] = None
         self._lock = threading.Lock()
+        self._new_reading = threading.Event()
         self._stop_event = threading.Event()
         self._thread: Optional[threading.Thread] = None
 
+        self._log_ctr = 0
+        self._last_logged_dist = 0
+
+        # Bytes read from the port that do not yet form a complete line
+        self._buf = bytearray()
+
         if self._serial is None:
             warning("RadarReader initialized without a radar serial device")
         else:
@@ -80,6 +97,11 @@ class RadarReader:
         if self._thread is not None and self._thread.is_alive():
             return
 
+        # A quiet board should cost at most one poll interval, not the
+        # 2 s timeout HWState leaves on the port after probing
+        self._serial.timeout = self._poll_interval
+        self._buf.clear()
+
         self._stop_event.clear()
         self._thread = threading.Thread(target=self._poll_loop, daemon=True)
         self._thread.start()
@@ -104,6 +126,16 @@ class RadarReader:
         with self._lock:
             return self._latest
 
+    def wait_for_reading(self, timeout: Optional[float] = None) -> bool:
+        """Block until a new reading arrives or timeout expires.
+
+        Returns True if a new reading was stored since the last call.
+        """
+        if self._new_reading.wait(timeout):
+            self._new_reading.clear()
+            return True
+        return False
+
     def get_distance_mm(self) -> Optional[int]:
         """Return the most recent distance in mm, or None if no reading."""
         reading = self.get_latest()
@@ -115,61 +147,78 @@ class RadarReader:
     # Internal polling loop
     # --------------------------
 
+    def _should_log(self, dist: int) -> bool:
+        """Rate-limit per-reading logs so stdout does not add jitter to polling."""
+        self._log_ctr += 1
+        if self._log_ctr >= RADAR_LOG_EVERY or abs(dist - self._last_logged_dist) > RADAR_LOG_DIST_DELTA_MM:
+            self._log_ctr = 0
+            self._last_logged_dist = dist
+            return True
+        return False
+
+    def _read_latest_line(self) -> Optional[bytes]:
+        """Return the newest complete line from the port, or None on timeout.
+
+        Reads whatever is waiting in one call and keeps any partial line for
+        next time, so a reply split across reads is not misparsed. If a late
+        reply piled up behind another, only the newest is returned.
+        """
+        while b"\n" not in self._buf:
+            chunk = self._serial.read(self._serial.in_waiting or 1)
+            if not chunk:
+                return None
+            self._buf += chunk
+
+        lines = self._buf.split(b"\n")
+        self._buf = lines.pop()  # incomplete tail, usually empty
+        return bytes(lines[-1])
+
     def _poll_loop(self) -> None:
         """Worker loop that sends READ and parses radar responses."""
         try:
             while not self._stop_event.is_set():
                 try:
                     self._serial.write(b"READ\r\n")
-                    line = self._serial.readline().decode("ascii", errors="ignore").strip()
+                    line = self._read_latest_line()
 
-                    if not line:
-                        time.sleep(self._poll_interval)
+                    if not line or not line.strip():
+                        self._stop_event.wait(self._poll_interval)
                         continue
 
-                    parts = line.split()
-                    if len(parts) != 6:
-                        warning(f"Unexpected format: {line}")
-                        time.sleep(self._poll_interval)
+                    # Parse straight from bytes; int() accepts ASCII digits
+                    m = _LINE_RE.match(line)
+                    if m is None:
+                        warning(f"Unexpected format: {line.decode('ascii', errors='ignore').strip()}")
+                        self._stop_event.wait(self._poll_interval)
                         continue
 
-                    try:
-                        vals = [int(p) for p in parts]
-                    except Exception as e:
-                        error(f"Parse error: {e}. Line='{line}'")
-                        time.sleep(self._poll_interval)
-                        continue
+                    vals = tuple(map(int, m.groups()))
 
-                    # vals: [ts, x, y, dist, angle, speed]
+                    # vals: (ts, x, y, dist, angle, speed)
                     ts, x, y, dist, angle, speed = vals
 
                     # Ignore readings where all sensor values are zero
-                    if ts == 0 and x == 0 and y == 0 and dist == 0 and angle == 0 and speed == 0:
-                        reading = RadarReading(ts, x, y, dist, angle, speed)
-                        info(
-                            f"Ignoring all-zero reading "
-                            f"ts={reading.timestamp_ms}, "
-                            f"x={reading.x_mm}, y={reading.y_mm}, "
-                            f"dist={reading.distance_mm}, "
-                            f"angle={reading.angle_deg}, "
-                            f"speed={reading.speed_cm_s}"
-                        )
+                    if vals == _ALL_ZERO:
+                        if self._should_log(dist):
+                            info("Ignoring all-zero reading")
                     else:
                         reading = RadarReading(ts, x, y, dist, angle, speed)
                         with self._lock:
                             self._latest = reading
-                        info(
-                            f"reading ts={reading.timestamp_ms}, "
-                            f"x={reading.x_mm}, y={reading.y_mm}, "
-                            f"dist={reading.distance_mm}, "
-                            f"angle={reading.angle_deg}, "
-                            f"speed={reading.speed_cm_s}"
-                        )
+                        self._new_reading.set()
+                        if self._should_log(dist):
+                            info(
+                                f"reading ts={reading.timestamp_ms}, "
+                                f"x={reading.x_mm}, y={reading.y_mm}, "
+                                f"dist={reading.distance_mm}, "
+                                f"angle={reading.angle_deg}, "
+                                f"speed={reading.speed_cm_s}"
+                            )
 
                 except Exception as e:
                     error(f"Error during READ: {e}")
 
-                time.sleep(self._poll_interval)
+                self._stop_event.wait(self._poll_interval)
 
         except Exception as e:
             error(f"RadarReader polling loop crashed: {e}")
\ No newline at end of file
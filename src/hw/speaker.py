@@ -1,31 +1,81 @@
+import queue
 import subprocess
 import threading
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 
-_say_lock = threading.Lock()
+from util.logger import error
 
 class Speaker:
     """Simple interface to system audio output.
 
     Uses macOS `say` for text to speech and `afplay` for audio playback.
+    Speech and playback each have one persistent worker thread fed by a
+    queue: utterances play one at a time in order, while a sound file can
+    play alongside speech as before.
     """
 
+    def __init__(self) -> None:
+        self._say_q: "queue.Queue[tuple[Callable, tuple, Optional[threading.Event]]]" = queue.Queue()
+        self._play_q: "queue.Queue[tuple[Callable, tuple, Optional[threading.Event]]]" = queue.Queue()
+        # Child process currently running on each worker, so stop() can end it
+        self._procs: dict[str, Optional[subprocess.Popen]] = {"say": None, "play": None}
+        self._procs_lock = threading.Lock()
+        for q, name in ((self._say_q, "speaker-say"), (self._play_q, "speaker-play")):
+            threading.Thread(target=self._worker_loop, args=(q,), name=name, daemon=True).start()
+
+    @staticmethod
+    def _worker_loop(q: queue.Queue) -> None:
+        """Run queued (fn, args, done) jobs one at a time, setting done after each."""
+        while True:
+            fn, args, done = q.get()
+            try:
+                fn(*args)
+            except Exception as e:
+                error(f"Speaker job failed: {e}")
+            finally:
+                if done is not None:
+                    done.set()
+
+    @staticmethod
+    def _drain(q: queue.Queue) -> None:
+        """Drop pending jobs, releasing anyone waiting on them."""
+        while True:
+            try:
+                _, _, done = q.get_nowait()
+            except queue.Empty:
+                return
+            if done is not None:
+                done.set()
+
     def stop(self) -> None:
         """Stop all audio playback, including afplay and say.
 
-        This uses killall to terminate macOS audio processes because the
-        worker threads use blocking subprocess.run calls and do not expose
-        process handles.
+        Pending utterances and files are dropped first, then the processes
+        this Speaker started are terminated. Other `say`/`afplay` processes
+        on the system are left alone.
         """
+        self._drain(self._say_q)
+        self._drain(self._play_q)
+        with self._procs_lock:
+            procs = list(self._procs.values())
+        for proc in procs:
+            try:
+                if proc is not None and proc.poll() is None:
+                    proc.terminate()
+            except Exception:
+                pass
+
+    def _run_process(self, kind: str, cmd: list[str]) -> None:
+        """Run cmd to completion, keeping its handle in self._procs[kind] meanwhile."""
+        proc = subprocess.Popen(cmd)
+        with self._procs_lock:
+            self._procs[kind] = proc
         try:
-            subprocess.run(["killall", "afplay"], check=False)
-        except Exception:
-            pass
-        try:
-            subprocess.run(["killall", "say"], check=False)
-        except Exception:
-            pass
+            proc.wait()
+        finally:
+            with self._procs_lock:
+                self._procs[kind] = None
 
     def _say_worker(
         self,
@@ -34,35 +84,34 @@ class Speaker:
         rate: Optional[int] = None,
         prefix: Optional[str] = None,
     ) -> None:
-        """Internal worker that performs the blocking `say` call under a mutex."""
+        """Internal worker that performs the blocking `say` call."""
         if not text:
             return
 
-        with _say_lock:
-            try:
-                cmd = ["say"]
+        try:
+            cmd = ["say"]
 
-                # Optional prefix
-                if prefix:
-                    text = f"{prefix} {text}"
+            # Optional prefix
+            if prefix:
+                text = f"{prefix} {text}"
 
-                # Optional voice
-                if voice:
-                    cmd.extend(["-v", voice])
+            # Optional voice
+            if voice:
+                cmd.extend(["-v", voice])
 
-                # Optional rate
-                if rate is not None:
-                    cmd.extend(["-r", str(rate)])
+            # Optional rate
+            if rate is not None:
+                cmd.extend(["-r", str(rate)])
 
-                cmd.append(text)
+            cmd.append(text)
 
-                subprocess.run(cmd, check=False)
-            except FileNotFoundError:
-                # `say` is not available on this system
-                pass
-            except Exception:
-                # Fail silently for other errors
-                pass
+            self._run_process("say", cmd)
+        except FileNotFoundError:
+            # `say` is not available on this system
+            pass
+        except Exception:
+            # Fail silently for other errors
+            pass
 
     def _play_worker(self, filepath: str) -> None:
         """Internal worker that performs the blocking `afplay` call."""
@@ -75,7 +124,7 @@ class Speaker:
             raise FileNotFoundError(f"Audio file does not exist: {path}")
 
         try:
-            subprocess.run(["afplay", str(path)], check=False)
+            self._run_process("play", ["afplay", str(path)])
         except FileNotFoundError:
             # `afplay` is not available on this system
             pass
@@ -89,31 +138,25 @@ class Speaker:
         voice: Optional[str] = None,
         rate: Optional[int] = None,
         prefix: Optional[str] = None,
+        wait: bool = False,
     ) -> None:
-        """Speak the given text using macOS `say` in a background thread.
+        """Speak the given text using macOS `say` on the speech worker.
 
-        A module level mutex ensures that only one underlying `say` call
-        runs at a time so audio does not overlap, but the caller returns
-        immediately.
+        Utterances are queued and spoken one at a time so audio does not
+        overlap, but the caller returns immediately. Pass wait=True to block
+        until this text has been spoken.
         """
         if not text:
             return
 
-        thread = threading.Thread(
-            target=self._say_worker,
-            args=(text, voice, rate, prefix),
-            daemon=True,
-        )
-        thread.start()
+        done = threading.Event() if wait else None
+        self._say_q.put((self._say_worker, (text, voice, rate, prefix), done))
+        if done is not None:
+            done.wait()
 
     def play(self, filepath: str) -> None:
-        """Play an audio file at the given path using `afplay` in a background thread."""
+        """Play an audio file at the given path using `afplay` on the playback worker."""
         if not filepath:
             return
 
-        thread = threading.Thread(
-            target=self._play_worker,
-            args=(filepath,),
-            daemon=True,
-        )
-        thread.start()
+        self._play_q.put((self._play_worker, (filepath,), None))
@@ -1,11 +1,12 @@
-import time
+import os
+import threading
 
 from hw.led.led_controller import LEDController
 from hw.motor.motor_controller import MotorController
 from engagement_controller import EngagementController
 from hw.hw_state import HWState
-from util.logger import info, warning
-from util.env_utils import load_env_file
+from util.logger import info, warning, set_log_level
+from util.env_utils import load_env_file, preload_personalities
 
 HW_STATE = HWState()
 
@@ -16,6 +17,8 @@ def main():
     engagement = None
     try:
         load_env_file()
+        set_log_level(os.environ.get("LOG_LEVEL", "INFO"))
+        preload_personalities()
 
         HW_STATE.load_hw_map()
         board_serials = HW_STATE.connect_peripherals()
@@ -31,9 +34,9 @@ def main():
 
         info("EngagementController started. Press Ctrl+C to stop.")
 
-        # Keep the main thread alive while idle animation runs
-        while True:
-            time.sleep(1)
+        # Keep the main thread alive while idle animation runs; block without
+        # polling until Ctrl+C interrupts the wait
+        threading.Event().wait()
         
     except KeyboardInterrupt:
         warning("Ctrl+C detected. Cleaning up...")
@@ -1,11 +1,68 @@
+from typing import Optional
+
 import numpy as np
 
-def pcm16le_bytes(x: np.ndarray) -> bytes:
-    """Convert float32 mono [-1,1] to PCM16LE bytes with clipping."""
+try:
+    # C extension with SIMD kernels that fuses square, mean and sqrt
+    import numpy_rms
+except ImportError:
+    numpy_rms = None
+
+# float32 constants keep the clip and scale loops in float32; a Python float
+# can make NumPy pick a float64 loop (and cast every sample) on some versions.
+# Clipping happens after scaling, so the bounds are in int16 units.
+_PCM_SCALE = np.float32(32767.0)
+_PCM_NEG = np.float32(-32767.0)
+
+def rms(x: np.ndarray) -> float:
+    """Return the RMS of a contiguous float32 mono buffer, or 0.0 if empty."""
+    if not x.size:
+        return 0.0
+    if numpy_rms is not None:
+        return float(numpy_rms.rms(x, window_size=x.size)[0])
+    # np.dot fuses square and sum without a temporary array
+    return float(np.sqrt(np.dot(x, x) / x.size))
+
+def pcm16le(x: np.ndarray, out: Optional[np.ndarray] = None, clip: bool = True,
+            scratch: Optional[np.ndarray] = None) -> np.ndarray:
+    """Convert float32 mono [-1,1] to a little-endian int16 array with clipping.
+
+    The result can be written straight to a file or wave object without
+    going through an intermediate bytes copy. Pass out (a '<i2' array or
+    view of x's length, e.g. over a caller-owned buffer) to skip allocating.
+    x itself is never modified, so callers can keep using their float buffer.
+    Pass clip=False to skip the clip pass when x is known to be in [-1, 1];
+    out-of-range samples then wrap or saturate depending on the platform.
+    Clipping goes through a float32 scratch array; pass a reused 1-D one at
+    least x.size long as scratch to avoid allocating it on every call.
+    """
     if x.dtype != np.float32:
         x = x.astype(np.float32, copy=False)
-    # clip to [-1, 1]
-    np.clip(x, -1.0, 1.0, out=x)
-    # scale and cast to little-endian int16 explicitly
-    i16 = (x * 32767.0).astype('<i2', copy=False)  # '<i2' = little-endian int16
-    return i16.tobytes()
\ No newline at end of file
+    if out is None:
+        out = np.empty(x.shape, dtype='<i2')  # '<i2' = little-endian int16
+    if not clip:
+        # scale and cast in one pass into the int16 output
+        np.multiply(x, _PCM_SCALE, out=out, casting='unsafe')
+        return out
+    if scratch is None or scratch.size < x.size:
+        scratch = np.empty(x.shape, dtype=np.float32)
+    else:
+        scratch = scratch[:x.size].reshape(x.shape)
+    # scale, clamp in place with plain min/max ufuncs, then cast; x is untouched
+    np.multiply(x, _PCM_SCALE, out=scratch)
+    np.minimum(scratch, _PCM_SCALE, out=scratch)
+    np.maximum(scratch, _PCM_NEG, out=scratch)
+    np.copyto(out, scratch, casting='unsafe')
+    return out
+
+def pcm16le_bytes(x: np.ndarray, clip: bool = True,
+                  scratch: Optional[np.ndarray] = None) -> bytearray:
+    """Convert float32 mono [-1,1] to PCM16LE bytes with clipping.
+
+    Samples are written straight into the returned bytearray, so there is no
+    int16 array plus tobytes() copy. clip and scratch are passed through to
+    pcm16le.
+    """
+    buf = bytearray(2 * x.size)
+    pcm16le(x, out=np.frombuffer(buf, dtype='<i2'), clip=clip, scratch=scratch)
+    return buf
\ No newline at end of file
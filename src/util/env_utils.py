@@ -1,29 +1,167 @@
 import os
+import re
+import mmap
 import json
+import threading
 from util.logger import warning
 
-def load_env_file(path: str = ".env"):
-    if not os.path.exists(path):
+try:
+    # Faster parser for the personality files; stdlib json is the fallback.
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError (a ValueError),
+    # so the except clauses below cover both.
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    _json_loads = json.loads
+
+# Files at least this big are mmapped and handed to orjson as a buffer instead
+# of being copied into a bytes object first. Below it a single read is cheaper.
+_MMAP_MIN_BYTES = 4096
+
+# Parsed personality configs keyed by name, stored as (mtime, cfg). A file is
+# only re-read when its modification time changes, so edits are picked up
+# without paying for a parse on every call.
+_PERSONALITY_CACHE: dict[str, tuple[float, dict]] = {}
+
+PERSONALITY_DIR = "personalities"
+
+# Keys every personality file must define
+_REQUIRED_KEYS = frozenset(("voice", "speed", "systemPrompt"))
+
+# Resolved file path per personality name, so the join is only done once
+_PERSONALITY_FILES: dict[str, str] = {}
+
+# Per-name locks so concurrent cache misses only read and parse a file once
+_LOCKS: dict[str, threading.Lock] = {}
+_LOCKS_LOCK = threading.Lock()
+
+_ENV_LOADED: set[str] = set()  # absolute paths load_env_file has already read
+
+# One KEY=value assignment per line. Comment lines never match because '#'
+# can't start a key, and [ \t] (not \s) keeps a match from running onto the
+# next line.
+_ENV_RE = re.compile(r'^[ \t]*([A-Za-z_][A-Za-z0-9_]*)[ \t]*=[ \t]*(.*?)[ \t]*\r?$', re.M)
+
+def load_env_file(path: str = ".env", force: bool = False):
+    # Values only ever fill unset variables, so a second read of the same file
+    # changes nothing; skip it unless force is set
+    key = os.path.abspath(path)
+    if key in _ENV_LOADED and not force:
+        return
+    try:
+        data = _read_small(path).decode('utf-8', 'replace')
+    except FileNotFoundError:
+        return
+    except Exception as e:
+        warning(f"Failed to load {path}: {e}")
         return
+    _ENV_LOADED.add(key)
     try:
-        with open(path, 'r') as f:
-            for line in f:
-                s = line.strip()
-                if not s or s.startswith('#') or '=' not in s:
-                    continue
-                k, v = s.split('=', 1)
-                os.environ.setdefault(k.strip(), v.strip())
+        for m in _ENV_RE.finditer(data):
+            os.environ.setdefault(m.group(1), m.group(2))
     except Exception as e:
         warning(f"Failed to load {path}: {e}")
 
+def _read_small(path: str) -> bytes:
+    """Read a whole file with os.read, skipping Python's file object stack.
+
+    The first read asks for the whole file as sized by fstat; reads continue
+    until EOF so a short read or a file that grew is never truncated.
+    json.loads detects the UTF encoding of the raw bytes itself, so no
+    TextIOWrapper decode layer is needed either.
+    """
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        chunks = []
+        want = os.fstat(fd).st_size + 1
+        while chunk := os.read(fd, want):
+            chunks.append(chunk)
+            want = 65536
+        return b"".join(chunks)
+    finally:
+        os.close(fd)
+
+def _load_json(path: str, size: int):
+    """Parse a JSON file, mapping it into memory when it is large enough."""
+    if orjson is None or size < _MMAP_MIN_BYTES:
+        return _json_loads(_read_small(path))
+    with open(path, 'rb') as f:
+        # Re-check on the open file: an in-place save may have truncated it
+        # since the caller's stat, and mmap refuses an empty file
+        if os.fstat(f.fileno()).st_size < _MMAP_MIN_BYTES:
+            return _json_loads(f.read())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return orjson.loads(memoryview(mm))
+
+def _personality_lock(name: str) -> threading.Lock:
+    """Return the per-name lock used to single-flight personality loads."""
+    with _LOCKS_LOCK:
+        lock = _LOCKS.get(name)
+        if lock is None:
+            lock = _LOCKS[name] = threading.Lock()
+        return lock
+
 def load_personality(name: str):
-    """Load personalities/<name>.json and validate required fields."""
-    path = os.path.join("personalities", f"{name}.json")
-    if not os.path.isfile(path):
-        raise FileNotFoundError(f"Personality file not found: {path}")
-    with open(path, "r", encoding="utf-8") as f:
-        cfg = json.load(f)
-    for k in ("voice", "speed", "systemPrompt"):
-        if k not in cfg:
-            raise KeyError(f"Personality '{name}' missing required key: {k}")
-    return cfg
\ No newline at end of file
+    """Load personalities/<name>.json and validate required fields.
+
+    Results are memoized per name with a "name" key already injected and
+    refreshed when the file's mtime changes. Callers get a shallow copy so
+    they can modify it without corrupting the cached entry. Concurrent
+    callers for the same name share a single load.
+    """
+    path = _PERSONALITY_FILES.get(name)
+    if path is None:
+        path = os.path.join(PERSONALITY_DIR, f"{name}.json")
+        _PERSONALITY_FILES[name] = path
+
+    with _personality_lock(name):
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Personality file not found: {path}")
+
+        cached = _PERSONALITY_CACHE.get(name)
+        if cached is not None and cached[0] == st.st_mtime:
+            return dict(cached[1])
+
+        try:
+            cfg = _load_json(path, st.st_size)
+        except (OSError, ValueError) as e:
+            # A half-written edit should not take down a personality that was
+            # already loaded; keep serving the last good copy from RAM.
+            # ValueError covers JSONDecodeError and a cut-off UTF-8 sequence.
+            if cached is None:
+                raise
+            warning(f"Failed to reload personality '{name}', using cached copy: {e}")
+            return dict(cached[1])
+        missing = _REQUIRED_KEYS.difference(cfg)
+        if missing:
+            if cached is not None:
+                warning(f"Reloaded personality '{name}' is missing {sorted(missing)}, using cached copy")
+                return dict(cached[1])
+            raise KeyError(f"Personality '{name}' missing required keys: {sorted(missing)}")
+        cfg["name"] = name
+        _PERSONALITY_CACHE[name] = (st.st_mtime, cfg)
+        return dict(cfg)
+
+def preload_personalities() -> None:
+    """Parse every personalities/*.json into the cache in one startup pass.
+
+    Invalid or unreadable files are skipped with a warning so they fall back
+    to the lazy path in load_personality (which raises the real error).
+    """
+    try:
+        entries = list(os.scandir(PERSONALITY_DIR))
+    except OSError as e:
+        warning(f"Failed to scan {PERSONALITY_DIR}: {e}")
+        return
+    for entry in entries:
+        if not entry.is_file() or not entry.name.endswith(".json"):
+            continue
+        name = entry.name[:-5]
+        _PERSONALITY_FILES.setdefault(name, entry.path)
+        try:
+            load_personality(name)
+        except Exception as e:
+            warning(f"Failed to preload personality '{name}': {e}")
\ No newline at end of file
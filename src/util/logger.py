@@ -1,27 +1,51 @@
 from datetime import datetime
-import inspect
+import sys
+
+_now = datetime.now
+
+LEVEL_INFO, LEVEL_WARN, LEVEL_ERROR = 10, 20, 30
+_LEVELS = {"INFO": LEVEL_INFO, "WARNING": LEVEL_WARN, "ERROR": LEVEL_ERROR}
+
+# Messages below this level return before any frame or timestamp work
+CURRENT_LEVEL = LEVEL_INFO
+
+def set_log_level(level):
+    """Set the minimum level to print, as a LEVEL_* int or "INFO"/"WARNING"/"ERROR"."""
+    global CURRENT_LEVEL
+    if isinstance(level, str):
+        level = _LEVELS.get(level.strip().upper())
+        if level is None:
+            return
+    CURRENT_LEVEL = level
 
 def now_ts():
     # ISO-like timestamp with milliseconds
-    return datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
+    return _now().isoformat(sep=' ', timespec='milliseconds')
 
 def info(msg):
-    frame = inspect.stack()[1]
-    filename = frame.filename
-    lineno = f"{frame.lineno:06d}"
+    if LEVEL_INFO < CURRENT_LEVEL:
+        return
+    # _getframe is O(1); inspect.stack() walks every frame and reads source files
+    frame = sys._getframe(1)
+    filename = frame.f_code.co_filename
+    lineno = f"{frame.f_lineno:06d}"
     level = "INFO  "
     print(f"[{now_ts()}] {filename}:{lineno} [{level}] {msg}")
 
 def warning(msg):
-    frame = inspect.stack()[1]
-    filename = frame.filename
-    lineno = f"{frame.lineno:06d}"
+    if LEVEL_WARN < CURRENT_LEVEL:
+        return
+    frame = sys._getframe(1)
+    filename = frame.f_code.co_filename
+    lineno = f"{frame.f_lineno:06d}"
     level = "WARNING"
     print(f"[{now_ts()}] {filename}:{lineno} [{level}] {msg}")
 
 def error(msg):
-    frame = inspect.stack()[1]
-    filename = frame.filename
-    lineno = f"{frame.lineno:06d}"
+    if LEVEL_ERROR < CURRENT_LEVEL:
+        return
+    frame = sys._getframe(1)
+    filename = frame.f_code.co_filename
+    lineno = f"{frame.f_lineno:06d}"
     level = "ERROR  "
     print(f"[{now_ts()}] {filename}:{lineno} [{level}] {msg}")
@@ -1,10 +1,31 @@
 import os
 import json
-from urllib import request as urlrequest, error as urlerror
+import http.client
+import threading
+from functools import lru_cache
 from util.logger import warning
 import re
 
-def query_ollama(messages: list):
+# One keep-alive connection per thread, so each turn skips the TCP handshake
+_local = threading.local()
+
+# Raised when a kept-alive connection was closed by the server while idle;
+# the request is retried once on a fresh connection
+_STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.CannotSendRequest,
+    BrokenPipeError,
+    ConnectionResetError,
+)
+
+@lru_cache(maxsize=2)
+def _request_config(stream: bool) -> tuple[str, int, bytes]:
+    """Read the Ollama settings once and pre-encode the fixed part of the body.
+
+    Returns (host, port, prefix), where prefix is the JSON payload up to the
+    "messages" value. The environment is loaded at startup and does not change
+    while the process runs, so this is cached per stream flag.
+    """
     host = os.environ.get("OLLAMA_HOST", "localhost")
     port = os.environ.get("OLLAMA_PORT", "11434")
     model = os.environ.get("BASE_MODEL", "gemma3:12b")
@@ -13,11 +34,9 @@ def query_ollama(messages: list):
     temperature = float(os.environ.get("TEMPERATURE", "0.6"))
     top_p = float(os.environ.get("TOP_P", "0.9"))
 
-    url = f"http://{host}:{port}/api/chat"
     payload = {
         "model": model,
-        "messages": messages,
-        "stream": False,
+        "stream": stream,
         "keep_alive": "24h",
         "options": {
             "num_ctx": num_ctx,
@@ -26,34 +45,136 @@ def query_ollama(messages: list):
             "top_p": top_p
         }
     }
-    data = json.dumps(payload).encode("utf-8")
-    req = urlrequest.Request(url, data=data, headers={"Content-Type": "application/json"})
+    # Drop the closing brace so the messages can be appended per request
+    prefix = json.dumps(payload, separators=(",", ":"))[:-1] + ',"messages":'
+    return host, int(port), prefix.encode("utf-8")
+
+def _build_request(messages: list, stream: bool) -> tuple[str, int, bytes]:
+    host, port, prefix = _request_config(stream)
+    data = prefix + json.dumps(messages, separators=(",", ":")).encode("utf-8") + b"}"
+    return host, port, data
+
+def _connection(host: str, port: int) -> http.client.HTTPConnection:
+    """Return this thread's connection to host:port, opening it if needed."""
+    conn = getattr(_local, "conn", None)
+    if conn is None or (conn.host, conn.port) != (host, port):
+        if conn is not None:
+            conn.close()
+        conn = http.client.HTTPConnection(host, port, timeout=30)
+        _local.conn = conn
+    return conn
+
+def _drop_connection() -> None:
+    """Close this thread's connection; the next request opens a new one."""
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        conn.close()
+        _local.conn = None
+
+def _post_chat(messages: list, stream: bool) -> http.client.HTTPResponse:
+    """POST to /api/chat over the kept-alive connection and return the response.
+
+    Raises OSError or http.client.HTTPException on failure, including a
+    non-200 status.
+    """
+    host, port, data = _build_request(messages, stream)
+    headers = {"Content-Type": "application/json"}
+    for attempt in range(2):
+        conn = _connection(host, port)
+        try:
+            conn.request("POST", "/api/chat", body=data, headers=headers)
+            resp = conn.getresponse()
+        except _STALE_CONNECTION_ERRORS:
+            _drop_connection()
+            if attempt:
+                raise
+            continue
+        except Exception:
+            _drop_connection()
+            raise
+        if resp.status != 200:
+            resp.read()
+            raise http.client.HTTPException(f"HTTP {resp.status} {resp.reason}")
+        return resp
+
+# Compiled once; _strip_emojis runs on every streamed chunk
+_EMOJI_RE = re.compile(
+    "["
+    "\U0001F600-\U0001F64F"  # emoticons
+    "\U0001F300-\U0001F5FF"  # symbols & pictographs
+    "\U0001F680-\U0001F6FF"  # transport & map symbols
+    "\U0001F1E0-\U0001F1FF"  # flags
+    "\U00002702-\U000027B0"
+    "\U000024C2-\U0001F251"
+    "]+",
+    flags=re.UNICODE
+)
+
+def _strip_emojis(text: str) -> str:
+    # Every stripped range is non-ASCII, and isascii() is a constant-time flag
+    # check in CPython, so plain replies skip the regex engine entirely
+    if text.isascii():
+        return text
+    return _EMOJI_RE.sub("", text)
+
+def query_ollama(messages: list):
     reply_text = ""
     try:
-        with urlrequest.urlopen(req, timeout=30) as resp:
-            body = resp.read().decode("utf-8", errors="ignore")
-            j = json.loads(body)
-            if isinstance(j, dict):
-                if "message" in j and isinstance(j["message"], dict):
-                    reply_text = j["message"].get("content", "") or ""
-    except urlerror.URLError as e:
+        resp = _post_chat(messages, stream=False)
+        # json accepts the raw UTF-8 bytes, so there is no separate decode copy
+        j = json.load(resp)
+        if isinstance(j, dict):
+            if "message" in j and isinstance(j["message"], dict):
+                reply_text = j["message"].get("content", "") or ""
+    except (OSError, http.client.HTTPException) as e:
         warning(f"Ollama request failed: {e}")
+        _drop_connection()
         return
     except Exception as e:
         warning(f"Ollama parsing error: {e}")
+        _drop_connection()
         return
     if reply_text:
         # Remove emojis from the reply text
-        emoji_pattern = re.compile(
-            "["
-            "\U0001F600-\U0001F64F"  # emoticons
-            "\U0001F300-\U0001F5FF"  # symbols & pictographs
-            "\U0001F680-\U0001F6FF"  # transport & map symbols
-            "\U0001F1E0-\U0001F1FF"  # flags
-            "\U00002702-\U000027B0"
-            "\U000024C2-\U0001F251"
-            "]+",
-            flags=re.UNICODE
-        )
-        reply_text = emoji_pattern.sub(r'', reply_text)
-        return reply_text
\ No newline at end of file
+        reply_text = _strip_emojis(reply_text)
+        return reply_text
+
+def query_ollama_stream(messages: list):
+    """Yield reply text from Ollama incrementally as it is generated.
+
+    Each yielded string is the next chunk of assistant content with emojis
+    removed. On request or parsing errors a warning is logged and the error
+    is re-raised, so callers can tell a cut-off reply from a complete one.
+    """
+    finished = False
+    try:
+        resp = _post_chat(messages, stream=True)
+        # Ollama streams one JSON object per line
+        for line in resp:
+            line = line.strip()
+            if not line:
+                continue
+            j = json.loads(line)
+            if not isinstance(j, dict):
+                continue
+            msg = j.get("message")
+            if isinstance(msg, dict):
+                delta = _strip_emojis(msg.get("content", "") or "")
+                if delta:
+                    yield delta
+            if j.get("done"):
+                # Consume the end of the chunked body so the connection can be reused
+                resp.read()
+                finished = True
+                return
+        finished = True
+    except (OSError, http.client.HTTPException) as e:
+        warning(f"Ollama request failed: {e}")
+        raise
+    except Exception as e:
+        warning(f"Ollama parsing error: {e}")
+        raise
+    finally:
+        # A reply abandoned mid-stream leaves unread data on the socket
+        if not finished:
+            _drop_connection()
@@ -0,0 +1,59 @@
+import heapq
+import itertools
+import threading
+import time
+from typing import Callable
+
+from util.logger import error
+
+
+class Scheduler:
+    """Run short callbacks after a delay on one shared daemon thread.
+
+    Replaces a threading.Timer (and so a new OS thread) per LED fade or motor
+    move. Callbacks run in deadline order on the scheduler thread, so they must
+    be quick and must not block.
+    """
+
+    def __init__(self) -> None:
+        self._heap: list[tuple[float, int, Callable[[], None]]] = []
+        self._counter = itertools.count()  # tie-breaker so callables are never compared
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+
+    def schedule(self, delay_s: float, fn: Callable[[], None]) -> None:
+        """Run fn roughly delay_s seconds from now."""
+        when = time.monotonic() + max(0.0, delay_s)
+        with self._cond:
+            heapq.heappush(self._heap, (when, next(self._counter), fn))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._heap:
+                    self._cond.wait()
+                when = self._heap[0][0]
+                delay = when - time.monotonic()
+                if delay > 0:
+                    # Woken early if an earlier deadline is pushed
+                    self._cond.wait(delay)
+                    continue
+                _, _, fn = heapq.heappop(self._heap)
+
+            try:
+                fn()
+            except Exception as e:
+                error(f"Scheduled callback failed: {e}")
+
+
+# Shared instance for the whole process
+_scheduler = Scheduler()
+
+
+def schedule(delay_s: float, fn: Callable[[], None]) -> None:
+    """Run fn roughly delay_s seconds from now on the shared scheduler thread."""
+    _scheduler.schedule(delay_s, fn)
@@ -1,39 +1,105 @@
 import numpy as np
-from util.audio_utils import pcm16le_bytes
-from util.logger import warning, error
+from util.audio_utils import pcm16le
+from util.logger import info, warning, error
 import wave
 import os
 import subprocess
+import threading
+from functools import lru_cache
 from util.audio_constants import SAMPLE_RATE, MIN_UTTERANCE_DURATION_MS
 
+# Shortest utterance worth transcribing, in samples
+_MIN_UTT_SAMPLES = (MIN_UTTERANCE_DURATION_MS * SAMPLE_RATE) // 1000
+
+# Scratch WAV handed to whisper-cli. On Linux it goes to tmpfs so the write and
+# re-read never touch disk; elsewhere (macOS has no /dev/shm) it stays in cwd.
+_UTT_WAV = (
+    "/dev/shm/lightwall-current-utterance.wav"
+    if os.path.isdir("/dev/shm")
+    else "current-utterance.wav"
+)
+
+# float32 scratch for pcm16le's clamp, grown to the longest utterance seen and
+# reused after that. Sharing it is safe: transcribe only ever runs on the
+# engagement controller's single STT worker thread.
+_pcm_scratch = np.empty(0, dtype=np.float32)
+
+# Optional in-process backend (SPEECH_RECOGNITION_BACKEND=faster-whisper)
+_fw_model = None
+_fw_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def _whisper_cli_prefix() -> tuple[str, ...]:
+    """whisper-cli and model arguments, resolved on first use.
+
+    Not done at import: .env is loaded by main() after this module is imported.
+    """
+    model_key = os.environ.get('SPEECH_RECOGNITION_MODEL', 'large-v3-turbo')
+    model_path = f"./whisper.cpp/models/ggml-{model_key}.bin"
+    cli = "./whisper.cpp/build/bin/whisper-cli"
+    return (cli, '-m', model_path)
+
+
+def _faster_whisper_model():
+    """Load the faster-whisper model once, or return None if it is unavailable."""
+    global _fw_model
+    with _fw_lock:
+        if _fw_model is None:
+            try:
+                from faster_whisper import WhisperModel
+            except ImportError:
+                warning("faster-whisper is not installed, falling back to whisper-cli")
+                return None
+            model_key = os.environ.get('SPEECH_RECOGNITION_MODEL', 'large-v3-turbo')
+            compute_type = os.environ.get('FASTER_WHISPER_COMPUTE_TYPE', 'int8')
+            _fw_model = WhisperModel(model_key, device="cpu", compute_type=compute_type)
+            info(f"Loaded faster-whisper model '{model_key}' ({compute_type})")
+        return _fw_model
+
+
+def _transcribe_faster_whisper(model, utt: np.ndarray) -> str:
+    """Transcribe in-process; VAD already ran upstream so its filter is off."""
+    segments, _ = model.transcribe(utt, language="en", vad_filter=False, beam_size=1)
+    return " ".join(s.text.strip() for s in segments).strip()
+
+
 def transcribe(utt: np.ndarray):
-    global chat_messages
-    """Write utterance to current-utterance.wav (PCM16LE), call whisper-cli once, and return the transcript."""
-    # Ensure float32 mono in [-1,1]
+    global chat_messages, _pcm_scratch
+    """Write utterance to a scratch WAV (PCM16LE), call whisper-cli once, and return the transcript."""
+    # Ensure float32 mono; clipping to [-1,1] happens once, in whichever
+    # backend path runs below (pcm16le clips as it quantizes)
     if utt.dtype != np.float32:
         utt = utt.astype(np.float32, copy=False)
-    np.clip(utt, -1.0, 1.0, out=utt)
 
-    # Ignore very short utterances (<5s)
-    duration_msec = 1000 * (utt.size / SAMPLE_RATE)
-    if duration_msec < MIN_UTTERANCE_DURATION_MS:
-        warning(f"Ignored short utterance ({duration_msec} ms)")
+    # Ignore very short utterances (< MIN_UTTERANCE_DURATION_MS)
+    if utt.size < _MIN_UTT_SAMPLES:
+        warning(f"Ignored short utterance ({1000 * utt.size / SAMPLE_RATE} ms)")
         return
 
-    out_wav = "current-utterance.wav"
+    if os.environ.get('SPEECH_RECOGNITION_BACKEND', 'whisper-cpp') == 'faster-whisper':
+        model = _faster_whisper_model()
+        if model is not None:
+            try:
+                np.clip(utt, -1.0, 1.0, out=utt)
+                return _transcribe_faster_whisper(model, utt)
+            except Exception as e:
+                error(f"faster-whisper failed, falling back to whisper-cli: {e}")
+
+    out_wav = _UTT_WAV
     # Write PCM16LE WAV
     with wave.open(out_wav, 'wb') as ww:
         ww.setnchannels(1)
         ww.setsampwidth(2)
         ww.setframerate(SAMPLE_RATE)
         ww.setcomptype('NONE', 'not compressed')
-        ww.writeframes(pcm16le_bytes(utt))
+        # wave accepts any buffer, so the int16 samples go out without a bytes copy
+        if _pcm_scratch.size < utt.size:
+            _pcm_scratch = np.empty(utt.size, dtype=np.float32)
+        ww.writeframes(pcm16le(utt, scratch=_pcm_scratch))
 
     # Call whisper-cli once
-    model_key = os.environ.get('SPEECH_RECOGNITION_MODEL', 'large-v3-turbo')
-    model_path = f"./whisper.cpp/models/ggml-{model_key}.bin"
-    cli = "./whisper.cpp/build/bin/whisper-cli"
-    cmd = [cli, '-m', model_path, out_wav, '--output-txt']
+    cmd = [*_whisper_cli_prefix(), out_wav, '--output-txt']
     try:
         subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
     except FileNotFoundError: